@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# Target calendars offered for comparisons, as period-start frequencies
+CALENDARS = {
+    "Diaria": "D",
+    "Mensual": "MS",
+    "Trimestral": "QS",
+    "Semestral": "6MS",
+    "Anual": "YS",
+}
+
+# How a series is collapsed into (or carried onto) each target period:
+#   last     - as-of value at the end of the period (carried forward when sparser)
+#   first    - first observation inside the period
+#   mean     - average of the observations inside the period
+#   sum      - total of the observations inside the period (flows)
+#   compound - compounded percentage change, for monthly rates such as inflation
+RULES = ("last", "first", "mean", "sum", "compound")
+
+
+def calendar(start, end, freq):
+    offset = to_offset(freq)
+    start = pd.Timestamp(start).normalize()
+    if not offset.is_on_offset(start):
+        start = offset.rollback(start)
+    return pd.date_range(start, pd.Timestamp(end), freq=freq)
+
+
+# Bin edges as int64 nanoseconds: period i covers [edges[i], edges[i + 1])
+def _edges(periods):
+    last = periods[-1] + to_offset(periods.freq)
+    return np.append(periods.as_unit("ns").asi8, last.as_unit("ns").value)
+
+
+def _window_sums(t, v, lo, hi):
+    valid = ~np.isnan(v)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, v, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    return sums[hi] - sums[lo], counts[hi] - counts[lo]
+
+
+# Align one sorted series onto the period edges with a single pair of searchsorted
+# calls. freq is the series' own frequency (the registry freq), which tells how
+# long its final observation stays current under the last rule
+def align_series(series, edges, rule="last", freq=None):
+    series = series.dropna().sort_index()
+    t = pd.DatetimeIndex(series.index).as_unit("ns").asi8
+    v = series.to_numpy(dtype=float)
+    out = np.full(len(edges) - 1, np.nan)
+    if len(t) == 0:
+        return out
+
+    lo = np.searchsorted(t, edges[:-1], side="left")
+    hi = np.searchsorted(t, edges[1:], side="left")
+
+    if rule == "last":
+        idx = hi - 1
+        ok = idx >= 0
+        out[ok] = v[idx[ok]]
+        # Do not extend a series past the end of its final observation's own
+        # period; without a frequency it stops at the final observation
+        stop = (pd.Timestamp(t[-1]) + to_offset(freq)).value if freq else t[-1] + 1
+        out[edges[:-1] >= stop] = np.nan
+    elif rule == "first":
+        ok = lo < hi
+        out[ok] = v[lo[ok]]
+    elif rule in ("mean", "sum"):
+        sums, counts = _window_sums(t, v, lo, hi)
+        ok = counts > 0
+        out[ok] = sums[ok] / counts[ok] if rule == "mean" else sums[ok]
+    elif rule == "compound":
+        sums, counts = _window_sums(t, np.log1p(v / 100), lo, hi)
+        ok = counts > 0
+        out[ok] = np.expm1(sums[ok]) * 100
+    else:
+        raise ValueError(f"Unknown aggregation rule: {rule}")
+    return out
+
+
+# Wide frame with one column per series on a common calendar; freqs holds the
+# frequency of each series (see align_series)
+def align(series, freq, rules=None, start=None, end=None, freqs=None):
+    rules = rules or {}
+    freqs = freqs or {}
+    start = start if start is not None else min(s.index.min() for s in series.values())
+    end = end if end is not None else max(s.index.max() for s in series.values())
+    periods = calendar(start, end, freq)
+    if len(periods) == 0:
+        return pd.DataFrame(columns=list(series))
+    edges = _edges(periods)
+    data = {name: align_series(s, edges, rules.get(name, "last"), freqs.get(name)) for name, s in series.items()}
+    return pd.DataFrame(data, index=pd.DatetimeIndex(periods, name="fecha"))
@@ -0,0 +1,38 @@
+import os
+
+import streamlit as st
+
+import metrics
+
+# Single entrypoint for every dashboard; all pages share the process-wide
+# data service in data_service.py, so one server replaces the standalone scripts
+st.set_page_config(page_title="Dash Econometrica", page_icon="📊", layout="wide")
+
+pg = st.navigation({
+    "Argentina": [
+        st.Page("pages/reservas.py", title="BCRA & INDEC", icon="📊", default=True),
+        st.Page("pages/comparar.py", title="Comparar Indicadores", icon="📉"),
+        st.Page("pages/inmobiliario.py", title="Propiedades en Venta", icon="🏠"),
+    ],
+    "Paraguay": [
+        st.Page("pages/paraguay.py", title="Inflación & Actividad", icon="📈"),
+    ],
+    "Modelos": [
+        st.Page("pages/pronostico.py", title="Pronóstico", icon="🔮"),
+    ],
+})
+
+
+# Prometheus /metrics endpoint, started once per server process
+@st.cache_resource
+def metrics_server():
+    return metrics.start_server(int(os.environ.get("METRICS_PORT", "9464")))
+
+
+metrics_server()
+
+pg.run()
+
+# Per-stage timings in the sidebar when the app is opened with ?debug=1
+if "debug" in st.query_params:
+    metrics.debug_panel()
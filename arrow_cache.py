@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import store
+
+logger = logging.getLogger(__name__)
+
+# Datasets shared by every server process on the host as uncompressed Arrow IPC
+# files, memory-mapped read-only; on Linux /dev/shm keeps them in shared memory
+ARROW_DIR = os.environ.get(
+    "DASH_ARROW_DIR",
+    "/dev/shm/dash_econometrica" if os.path.isdir("/dev/shm") else os.path.join(store.STORE_DIR, "arrow"),
+)
+INDEX = "__index__"
+
+
+def _path(key, token):
+    return os.path.join(ARROW_DIR, f"{key}-{token}.arrow")
+
+
+# Numeric columns are written as plain arrays so NaN stays NaN (not null) and
+# can be viewed from pandas without conversion; other columns go through pandas rules
+def _array(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "biufmM":
+        return pa.array(values)
+    return pa.array(values, from_pandas=True)
+
+
+def _write(path, df):
+    arrays = [_array(df.index)] + [_array(df[c]) for c in df.columns]
+    names = [INDEX] + [f"c{i}" for i in range(len(df.columns))]
+    meta = {
+        "columns": [list(c) if isinstance(c, tuple) else c for c in df.columns],
+        "column_names": list(df.columns.names),
+        "index_name": df.index.name,
+    }
+    table = pa.Table.from_arrays(arrays, names=names).replace_schema_metadata({"dash": json.dumps(meta, default=str)})
+    batch = table.combine_chunks().to_batches()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as f:
+        with pa.ipc.new_file(f, table.schema) as writer:
+            for b in batch:
+                writer.write_batch(b)
+    os.replace(tmp, path)
+
+
+def _column(table, name):
+    chunks = table.column(name).chunks
+    if len(chunks) == 1:
+        try:
+            return chunks[0].to_numpy(zero_copy_only=True)
+        except pa.ArrowInvalid:
+            pass
+    return table.column(name).to_numpy()
+
+
+# Read-only DataFrame whose numeric and datetime columns point straight into
+# the mapped file; None when this version has not been published yet. The
+# column arrays hold the Arrow buffers, which hold the mapping, so it is
+# released (and a pruned file's pages freed) once the frame is dropped
+def open_view(key, token):
+    path = _path(key, token)
+    try:
+        source = pa.memory_map(path, "r")
+    except FileNotFoundError:
+        return None
+    table = pa.ipc.open_file(source).read_all()
+    meta = json.loads(table.schema.metadata[b"dash"])
+
+    columns = [tuple(c) if isinstance(c, list) else c for c in meta["columns"]]
+    if columns and isinstance(columns[0], tuple):
+        labels = pd.MultiIndex.from_tuples(columns, names=meta["column_names"])
+    else:
+        labels = pd.Index(columns, name=meta["column_names"][0])
+    index = _column(table, INDEX)
+    index = pd.DatetimeIndex(index, copy=False) if index.dtype.kind == "M" else pd.Index(index, copy=False)
+    index.name = meta["index_name"]
+    data = {i: _column(table, f"c{i}") for i in range(len(columns))}
+    df = pd.DataFrame(data, index=index, copy=False)
+    df.columns = labels
+    return df
+
+
+# Drop other versions of a dataset; processes still mapping them keep their views
+def _prune(key, keep):
+    prefix = f"{key}-"
+    for name in os.listdir(ARROW_DIR):
+        path = os.path.join(ARROW_DIR, name)
+        if name.startswith(prefix) and name.endswith(".arrow") and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Publish df under (key, token) unless another process already did, and return
+# the shared view. Frames Arrow cannot represent, or whose file another process
+# pruned in the meantime, are returned unchanged
+def share(key, token, df):
+    path = _path(key, token)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(ARROW_DIR, exist_ok=True)
+            _write(path, df)
+            _prune(key, path)
+        view = open_view(key, token)
+        return view if view is not None else df
+    except (pa.ArrowException, TypeError, ValueError, OSError):
+        logger.warning("Could not share %s through Arrow; keeping a private copy", key, exc_info=True)
+        return df
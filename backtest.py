@@ -0,0 +1,151 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import data_service
+import store
+
+MODELS = ("ARMA", "Random Forest", "LSTM")
+TARGET = "Global_active_power"
+
+# Store keys of the persisted results
+FORECASTS_KEY = "backtest_pronosticos"
+HORIZON_KEY = "backtest_metricas"
+ORIGIN_KEY = "backtest_origenes"
+
+# Models and inputs loaded once per worker process by _init_worker
+_models = None
+_inputs = None
+
+
+def _init_worker():
+    global _models, _inputs
+    _models = data_service.load_forecast_models()
+    _inputs = data_service.load_forecast_inputs()
+
+
+# ARMA paths from each origin: the fitted state is extended with the actuals
+# observed up to the origin (parameters fixed, no refit) and forecast forward.
+# Origins come sorted, so each step only filters the new observations
+def _arma_paths(origins, horizon):
+    actual = _inputs[0][TARGET].to_numpy(dtype=float)
+    results = _models["ARMA"]
+    extend = getattr(results, "extend", None) or results.append
+    paths = np.empty((len(origins), horizon))
+    seen = 0
+    for i, origin in enumerate(origins):
+        if origin > seen:
+            results = extend(actual[seen:origin])
+            extend = getattr(results, "extend", None) or results.append
+            seen = origin
+        paths[i] = np.asarray(results.forecast(steps=horizon))
+    return paths
+
+
+# Recursive multi-step paths for the window-based models, vectorized over all
+# origins: feature rows are lag windows ordered oldest to newest, so each step
+# shifts the window and appends the previous step's prediction
+def _recursive_paths(predict, windows, horizon):
+    X = np.array(windows, dtype=float, copy=True)
+    paths = np.empty((len(X), horizon))
+    for h in range(horizon):
+        paths[:, h] = np.asarray(predict(X)).reshape(len(X))
+        if h + 1 < horizon:
+            X = np.roll(X, -1, axis=1)
+            X[:, -1] = paths[:, h].reshape((-1,) + X.shape[2:])
+    return paths
+
+
+def _run(model, origins, horizon):
+    _, X_rf, X_lstm = _inputs
+    if model == "ARMA":
+        paths = _arma_paths(origins, horizon)
+    elif model == "Random Forest":
+        paths = _recursive_paths(_models["Random Forest"].predict, X_rf[origins], horizon)
+    else:
+        lstm = _models["LSTM"]
+        scaled = _recursive_paths(lambda X: lstm.predict(X, verbose=0).flatten(), X_lstm[origins], horizon)
+        paths = _models["scaler"].inverse_transform(scaled.reshape(-1, 1)).reshape(scaled.shape)
+    return model, origins, paths
+
+
+# MAE / RMSE / MAPE over an (origins x horizon) error matrix along one axis
+def error_metrics(forecast, actual, axis):
+    err = forecast - actual
+    abs_err = np.abs(err)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(actual != 0, abs_err / np.abs(actual), np.nan)
+        return {
+            "n": np.sum(~np.isnan(err), axis=axis),
+            "MAE": np.nanmean(abs_err, axis=axis),
+            "RMSE": np.sqrt(np.nanmean(err ** 2, axis=axis)),
+            "MAPE": np.nanmean(pct, axis=axis) * 100,
+        }
+
+
+def run(models=MODELS, horizon=60, step=60, workers=None, chunk=200):
+    test_df, _, _ = data_service.load_forecast_inputs()
+    actual = test_df[TARGET].to_numpy(dtype=float)
+    dates = test_df["dt"].to_numpy()
+    origins = np.arange(0, len(actual), step)
+
+    # Actual value for every (origin, horizon) cell, NaN past the end of the test set
+    cells = origins[:, None] + np.arange(horizon)
+    inside = cells < len(actual)
+    actual_paths = np.where(inside, actual[np.minimum(cells, len(actual) - 1)], np.nan)
+
+    paths = {model: np.empty((len(origins), horizon)) for model in models}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_run, model, origins[i:i + chunk], horizon)
+            for model in models
+            for i in range(0, len(origins), chunk)
+        ]
+        for future in as_completed(futures):
+            model, chunk_origins, chunk_paths = future.result()
+            rows = np.searchsorted(origins, chunk_origins)
+            paths[model][rows] = chunk_paths
+
+    forecasts, by_horizon, by_origin = [], [], []
+    for model in models:
+        forecast = np.where(inside, paths[model], np.nan)
+        forecasts.append(pd.DataFrame({
+            "modelo": model,
+            "origen": np.repeat(dates[origins], horizon),
+            "horizonte": np.tile(np.arange(1, horizon + 1), len(origins)),
+            "fecha": dates[np.minimum(cells, len(actual) - 1)].ravel(),
+            "pronostico": forecast.ravel(),
+            "real": actual_paths.ravel(),
+        }).dropna(subset=["real"]))
+        by_horizon.append(pd.DataFrame({"modelo": model, "horizonte": np.arange(1, horizon + 1),
+                                        **error_metrics(forecast, actual_paths, axis=0)}))
+        by_origin.append(pd.DataFrame({"modelo": model, "origen": dates[origins],
+                                       **error_metrics(forecast, actual_paths, axis=1)}))
+
+    meta = {"horizon": horizon, "step": step, "models": list(models)}
+    store.write(FORECASTS_KEY, pd.concat(forecasts, ignore_index=True), **meta)
+    store.write(HORIZON_KEY, pd.concat(by_horizon, ignore_index=True), **meta)
+    store.write(ORIGIN_KEY, pd.concat(by_origin, ignore_index=True), **meta)
+    return pd.concat(by_horizon, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the ARMA, Random Forest and LSTM models")
+    parser.add_argument("--model", action="append", dest="models", choices=MODELS, help="model (repeatable, default: all)")
+    parser.add_argument("--horizon", type=int, default=60, help="steps ahead from each origin")
+    parser.add_argument("--step", type=int, default=60, help="distance between consecutive origins")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk", type=int, default=200, help="origins per task")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    metrics = run(args.models or MODELS, args.horizon, args.step, args.workers, args.chunk)
+    print(metrics.groupby("modelo")[["MAE", "RMSE", "MAPE"]].mean().round(4))
+    print(f"Backtest stored in {store.STORE_DIR} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import base64
+import json
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from metrics import instrumented
+
+# Figures with more points than this go out as WebGL traces
+WEBGL_POINTS = int(os.environ.get("DASH_WEBGL_POINTS", 2000))
+
+# Array attributes sent as base64 typed arrays instead of JSON number lists
+BINARY_ATTRS = ("x", "y")
+
+# plotly.js typed arrays; 64-bit integers are sent as float64
+DTYPES = ("f8", "f4", "i4", "i2", "i1", "u4", "u2", "u1")
+
+
+def points(fig):
+    total = 0
+    for trace in fig.data:
+        values = trace.x if trace.x is not None else trace.y
+        total += len(values) if values is not None else 0
+    return total
+
+
+# Typed-array spec for a numeric or datetime array; datetimes become epoch
+# milliseconds, which date axes read directly. None when values are not numeric
+def _typed(values):
+    a = np.asarray(values)
+    is_date = a.dtype.kind == "M"
+    if is_date:
+        a = a.astype("datetime64[ms]").astype("int64")
+    if a.dtype.kind not in "biuf":
+        return None, False
+    code = a.dtype.str[1:]
+    if code not in DTYPES:
+        a, code = a.astype("float64"), "f8"
+    a = np.ascontiguousarray(a).astype(a.dtype.newbyteorder("<"), copy=False)
+    return {"dtype": code, "bdata": base64.b64encode(a.tobytes()).decode("ascii")}, is_date
+
+
+# JSON-ready spec of a figure: scatter traces switch to WebGL above
+# WEBGL_POINTS and x/y arrays are base64-encoded. The result is what gets
+# cached, so a repeated view hands st.plotly_chart a spec with the data already
+# serialized
+@instrumented("transform", "encode_figure")
+def encode(fig):
+    if points(fig) > WEBGL_POINTS:
+        data = [
+            go.Scattergl(trace.to_plotly_json(), skip_invalid=True) if trace.type == "scatter" else trace
+            for trace in fig.data
+        ]
+        fig = go.Figure(data=data, layout=fig.layout)
+    spec = fig.to_plotly_json()
+    for trace in spec["data"]:
+        for attr in BINARY_ATTRS:
+            if trace.get(attr) is None:
+                continue
+            typed, is_date = _typed(trace[attr])
+            if typed is None:
+                continue
+            trace[attr] = typed
+            if is_date:
+                axis = trace.get(f"{attr}axis", attr)
+                name = f"{attr}axis{axis[1:]}"
+                spec["layout"].setdefault(name, {})["type"] = "date"
+    return json.loads(pio.to_json(spec, validate=False))
+
+
+# Encoded figure cached per (dataset version, view); build runs only on a miss
+def cached(service, key, view, build):
+    return service.derived(key, "figure", tuple(view), lambda frame: encode(build()))
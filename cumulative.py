@@ -0,0 +1,80 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+import store
+
+# Prefix-sum arrays live next to the dataset store as .npy files and are opened
+# memory-mapped, so every server process shares one copy through the page cache
+PREFIX_DIR = os.path.join(store.STORE_DIR, "prefix")
+
+_lock = threading.Lock()
+_cache = {}  # fingerprint -> {name: memmap}
+
+
+def _fingerprint(arrays):
+    digest = hashlib.sha1()
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(arrays[name], dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+# prefix[i] = sum of values[:i], with NaN counted as zero
+def _prefix(values):
+    values = np.nan_to_num(np.asarray(values, dtype=float))
+    return np.concatenate(([0.0], np.cumsum(values)))
+
+
+def _open(path, values):
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, _prefix(values))
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+# Prefix sums of the actuals, of each model's predictions and of each model's
+# errors and squared errors, built once per forecast version
+def prefix_sums(actual, preds):
+    arrays = {"Actual": np.asarray(actual, dtype=float)}
+    for model, pred in preds.items():
+        pred = np.asarray(pred, dtype=float)
+        n = min(len(pred), len(actual))
+        err = pred[:n] - arrays["Actual"][:n]
+        arrays[model] = pred
+        arrays[f"{model}:err"] = err
+        arrays[f"{model}:err2"] = err * err
+
+    key = _fingerprint(arrays)
+    with _lock:
+        if key not in _cache:
+            folder = os.path.join(PREFIX_DIR, key)
+            os.makedirs(folder, exist_ok=True)
+            _cache[key] = {
+                name: _open(os.path.join(folder, hashlib.sha1(name.encode()).hexdigest()[:12] + ".npy"), values)
+                for name, values in arrays.items()
+            }
+        return _cache[key]
+
+
+# Running total of values[start:end] from a prefix array: one vectorized subtraction
+def window(prefix, start, end):
+    end = min(end, len(prefix) - 1)
+    return np.asarray(prefix[start + 1:end + 1]) - prefix[start]
+
+
+# Cumulative actual and forecast over [start, end) with a 95% band that grows
+# with the square root of the steps, using the window's own error bias and spread
+def cumulative_window(prefixes, model, start, end, z=1.96):
+    end = min(end, len(prefixes[model]) - 1, len(prefixes[f"{model}:err"]) - 1)
+    actual = window(prefixes["Actual"], start, end)
+    forecast = window(prefixes[model], start, end)
+    n = end - start
+    err_sum = prefixes[f"{model}:err"][end] - prefixes[f"{model}:err"][start]
+    err2_sum = prefixes[f"{model}:err2"][end] - prefixes[f"{model}:err2"][start]
+    sigma = np.sqrt(max(err2_sum / n - (err_sum / n) ** 2, 0.0)) if n > 0 else np.nan
+    half_width = z * sigma * np.sqrt(np.arange(1, n + 1))
+    return actual, forecast, forecast - half_width, forecast + half_width
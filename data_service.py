@@ -0,0 +1,434 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+import pandas as pd
+import numpy as np
+import streamlit as st
+
+import arrow_cache
+import forecasting
+import ipc_reader
+import seasonal
+import snapshot
+import store
+import versioning
+from metrics import record_bytes, record_cache, timed
+
+logger = logging.getLogger(__name__)
+
+requests.packages.urllib3.disable_warnings()
+
+# Upstream hosts used by the dashboards. Each one can be pointed elsewhere with
+# DASH_<HOST>_URL, or all of them at the replay server with DASH_REPLAY_URL
+SOURCES = {
+    "bcra": "https://api.bcra.gob.ar",
+    "indec": "https://www.indec.gob.ar",
+    "economia": "https://www.economia.gob.ar",
+    "github": "https://github.com",
+}
+
+# Remote resources, relative to their host in SOURCES
+BCRA_PATH = "/estadisticas/v3.0/monetarias/{id_variable}"
+INDEC_IPC_PATH = "/ftp/cuadros/economia/sh_ipc_aperturas.xls"
+INDEC_POVERTY_PATH = "/ftp/cuadros/sociedad/cuadros_informe_pobreza_03_25.xls"
+ECONOMIA_BC_PATH = "/download/infoeco/apendice5.xlsx"
+GITHUB_RAW_PATH = "/sfkaplan/Dash_Econometrica/raw/refs/heads/main/{name}"
+FORECAST_DIR = "C:\\Curso Pronóstico\\2025"
+
+# Optional hook called with (host, path, response) after every fetch; set by replay.py when recording
+_recorder = None
+
+
+def set_recorder(recorder):
+    global _recorder
+    _recorder = recorder
+
+
+def base_url(host):
+    override = os.environ.get(f"DASH_{host.upper()}_URL")
+    if override:
+        return override.rstrip("/")
+    replay = os.environ.get("DASH_REPLAY_URL")
+    if replay:
+        return f"{replay.rstrip('/')}/{host}"
+    return SOURCES[host]
+
+
+# HTTP GET with fetch latency and payload size recorded under the source name
+def _fetch(host, path, source, **kwargs):
+    with timed("fetch", source):
+        response = requests.get(base_url(host) + path, **kwargs)
+        response.raise_for_status()
+    record_bytes(source, len(response.content))
+    if _recorder is not None:
+        _recorder(host, path, response)
+    return response
+
+
+# Function to fetch a monetary series from the BCRA API
+def get_bcra_data(id_variable):
+    response = _fetch("bcra", BCRA_PATH.format(id_variable=id_variable), "bcra", verify=False)
+    with timed("parse", "bcra"):
+        aux = response.json()
+        df = pd.DataFrame(aux["results"])[["fecha", "valor"]]
+        df["fecha"] = pd.to_datetime(df["fecha"])
+        df.set_index("fecha", inplace=True)
+    return df.sort_index()
+
+
+# Function to fetch every IPC opening (region x division) from INDEC in one pass
+def get_ipc_openings():
+    response = _fetch("indec", INDEC_IPC_PATH, "indec_ipc")
+    with timed("parse", "indec_ipc"):
+        df2 = ipc_reader.read_ipc_openings(response.content)
+    return df2.sort_index()
+
+
+# Function to fetch household poverty data from INDEC
+def get_poverty_data():
+    response = _fetch("indec", INDEC_POVERTY_PATH, "indec_pobreza")
+    with timed("parse", "indec_pobreza"), BytesIO(response.content) as excel_file:
+        df = pd.read_excel(excel_file)
+    poverty = pd.DataFrame(df.iloc[4, 1:].T)
+    poverty.columns = ["Hogares"]
+    # Create the datetime index starting from December 1, 2016, with 6-month intervals
+    poverty.index = pd.date_range(start="2016-12-01", periods=len(poverty), freq="6MS")
+    return poverty
+
+
+# Function to fetch the trade balance from economia.gob.ar
+def get_bc_data():
+    response = _fetch("economia", ECONOMIA_BC_PATH, "economia_bc")
+    with timed("parse", "economia_bc"), BytesIO(response.content) as excel_file:
+        df = pd.read_excel(excel_file, sheet_name='1. ICA')
+    bc = pd.DataFrame(df.iloc[272:, -4])
+    bc.columns = ['Balanza Comercial']
+    bc.index = pd.to_datetime(df.iloc[272:, 0])
+    return bc.sort_index()
+
+
+# Function to fetch IMAEP data from BCP
+def get_imaep_data():
+    response = _fetch("github", GITHUB_RAW_PATH.format(name="anexo.xlsx"), "bcp_anexo")
+    with timed("parse", "bcp_anexo"), BytesIO(response.content) as excel_file:
+        df = pd.read_excel(excel_file, sheet_name="CUADRO 9", skiprows=9)
+    dates = df.iloc[1:-3, 1]
+    data = df.iloc[1:-3, 2:]
+    df2 = pd.DataFrame(data)
+    df2.columns = df.columns[2:]
+    df2.index = pd.to_datetime(dates)
+    df2 = df2.dropna()  # Remove NaN values
+    return df2
+
+
+# Function to fetch inflation data from BCP
+def get_inf_data():
+    response = _fetch("github", GITHUB_RAW_PATH.format(name="anexo.xlsx"), "bcp_anexo")
+    with timed("parse", "bcp_anexo"), BytesIO(response.content) as excel_file:
+        df = pd.read_excel(excel_file, sheet_name="CUADRO 14", skiprows=10)
+    dates = df.iloc[1:-3, 0]
+    data = df.iloc[1:-3, 1:-3]
+    df2 = pd.DataFrame(data)
+    df2.columns = df.columns[1:-3]
+    df2.index = pd.to_datetime(dates)
+    df2 = df2.dropna()  # Remove NaN values
+    return df2
+
+
+# Function to load the property listings workbook
+def load_data(tipo):
+    if tipo == "Departamento":
+        name = "departamentos.xlsx"
+    elif tipo == "Casa":
+        name = "casas.xlsx"
+    else:
+        return pd.DataFrame()
+    response = _fetch("github", GITHUB_RAW_PATH.format(name=name), "github_listings")
+    with timed("parse", "github_listings"), BytesIO(response.content) as excel_file:
+        df = pd.read_excel(excel_file)
+    # Precio por m² is derived here so pages never mutate the shared frame
+    df["Precio_m2"] = df["Precio_USD"] / df["Superficie_m2"]
+    return df
+
+
+# Function to load the power-consumption test set and the feature windows of each model
+def load_forecast_inputs():
+    test_df = pd.read_csv(f"{FORECAST_DIR}\\test_power_consumption.csv", parse_dates=['dt'])
+    X_test_rf = np.load(f"{FORECAST_DIR}\\test_power_consumption_rf.npy")
+    X_test_lstm = np.load(f"{FORECAST_DIR}\\test_power_consumption_lstm.npy")
+    return test_df, X_test_rf, X_test_lstm
+
+
+# Function to load the pre-fitted ARMA, Random Forest and LSTM models and the LSTM scaler
+def load_forecast_models():
+    import joblib
+    from keras.models import load_model
+
+    return {
+        "ARMA": joblib.load("arma_model.pkl"),
+        "Random Forest": joblib.load("rf_model.pkl"),
+        "LSTM": load_model("lstm_model.keras", compile=False),
+        "scaler": joblib.load("scaler.pkl"),
+    }
+
+
+# Function to load the test set and the full-length forecast of each model
+def get_forecast_data():
+    test_df, X_test_rf, X_test_lstm = load_forecast_inputs()
+    models = load_forecast_models()
+
+    preds = {}
+    with timed("predict", "ARMA"):
+        preds["ARMA"] = np.asarray(models["ARMA"].forecast(steps=len(test_df)))
+    with timed("predict", "Random Forest"):
+        preds["Random Forest"] = models["Random Forest"].predict(X_test_rf)
+    with timed("predict", "LSTM"):
+        lstm_preds = models["LSTM"].predict(X_test_lstm).flatten()
+        preds["LSTM"] = models["scaler"].inverse_transform(lstm_preds.reshape(-1, 1)).flatten()
+    return {"test_df": test_df, "preds": preds}
+
+
+# Key of the dataset holding the batch forecasts of another one
+def forecast_key(key):
+    return f"{key}_pronostico"
+
+
+# Function to read a dataset published to the local store by a batch job
+def load_stored(name):
+    return store.read(name)
+
+
+# Registry of every dataset served by the app: key -> loader, label, group,
+# frequency, upstream host and default aggregation rule (see alignment.RULES).
+# Datasets with a source are computed from that dataset's frame by their loader
+# and refreshed together with it
+DATASETS = {}
+
+
+def register_dataset(key, loader, label, group, freq=None, host=None, agg="last", source=None, **kwargs):
+    DATASETS[key] = {
+        "loader": loader,
+        "label": label,
+        "group": group,
+        "freq": freq,
+        "host": host,
+        "agg": agg,
+        "source": source,
+        "kwargs": kwargs,
+    }
+
+
+register_dataset("reservas", get_bcra_data, "Reservas Internacionales (USD mn)", "bcra_indec", freq="D", host="bcra", id_variable=1)
+register_dataset("base_monetaria", get_bcra_data, "Base Monetaria (ARS mn)", "bcra_indec", freq="D", host="bcra", id_variable=15)
+register_dataset("ipc_aperturas", get_ipc_openings, "IPC Aperturas (%)", "indec", freq="MS", host="indec")
+# Headline inflation is selected from the openings, so one download and parse serves both
+register_dataset("inflacion", ipc_reader.select_series, "Inflación Mensual (%)", "bcra_indec", freq="MS", agg="compound",
+                 source="ipc_aperturas", spec=ipc_reader.IPC_SPEC)
+register_dataset("pobreza", get_poverty_data, "Pobreza Hogares (%)", "bcra_indec", freq="6MS", host="indec")
+register_dataset("bc", get_bc_data, "Balanza Comercial (USD mn)", "bcra_indec", freq="MS", host="economia", agg="sum")
+register_dataset("actividad", get_imaep_data, "IMAEP", "paraguay", freq="MS", host="github")
+register_dataset("infla", get_inf_data, "Inflación", "paraguay", freq="MS", host="github")
+register_dataset("actividad_sa", seasonal.decompose_frame, "IMAEP", "desestacionalizado", freq="MS", source="actividad")
+register_dataset("infla_sa", seasonal.decompose_frame, "Inflación", "desestacionalizado", freq="MS", source="infla")
+register_dataset("departamentos", load_data, "Departamento", "inmobiliario", host="github", tipo="Departamento")
+register_dataset("casas", load_data, "Casa", "inmobiliario", host="github", tipo="Casa")
+register_dataset("consumo", get_forecast_data, "Consumo Eléctrico", "pronostico", freq="min")
+register_dataset("backtest_metricas", load_stored, "Backtest por horizonte", "backtest", name="backtest_metricas")
+register_dataset("backtest_origenes", load_stored, "Backtest por origen", "backtest", name="backtest_origenes")
+
+# Forecast and 95% interval of every column of each indicator, refreshed
+# together with it (see forecasting.py)
+for _key in ("reservas", "base_monetaria", "inflacion", "ipc_aperturas", "pobreza", "bc", "actividad", "infla"):
+    _spec = DATASETS[_key]
+    register_dataset(forecast_key(_key), forecasting.forecast_frame, _spec["label"], "pronosticos",
+                     freq=_spec["freq"], source=_key, name=_key, step=_spec["freq"])
+
+
+# Run the registered loader for a dataset straight from its upstream source
+def load_dataset(key):
+    spec = DATASETS[key]
+    if spec["source"] is not None:
+        return derive(key, load_dataset(spec["source"]))
+    with timed("load", key):
+        return spec["loader"](**spec["kwargs"])
+
+
+# Compute a dataset registered with a source from that source's frame
+def derive(key, frame):
+    spec = DATASETS[key]
+    with timed("derive", key):
+        return spec["loader"](frame, **spec["kwargs"])
+
+
+# Datasets computed from key
+def dependents(key):
+    return [k for k, spec in DATASETS.items() if spec["source"] == key]
+
+
+# Indicator selector for a page: display label -> dataset key
+def indicators(group):
+    return {spec["label"]: key for key, spec in DATASETS.items() if spec["group"] == group}
+
+
+# Holds each parsed dataset once per process; concurrent sessions asking for
+# the same key wait on a per-key lock instead of fetching it twice. Datasets
+# kept up to date by etl_worker.py are read from the local store only, and
+# reloaded when the worker writes a new version. Otherwise datasets present in
+# the snapshot bundle are served from it immediately and refreshed from
+# upstream in the background
+class DataService:
+    def __init__(self, bundle=None, refresh=True, shared=False):
+        self._frames = {}  # key -> (frame, content hash), replaced as one tuple
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._bundle = bundle
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="refresh") if refresh else None
+        self._refreshing = set()
+        self._stored = {}  # key -> store version currently held in _frames
+        self._derived = versioning.DerivedCache()
+        self._shared = shared  # hold frames as Arrow views shared across processes
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load(self, key):
+        source = DATASETS[key]["source"]
+        if source is not None:
+            return derive(key, self.get(source))
+        return load_dataset(key)
+
+    # Install a (re)loaded frame. Identical content keeps the current object;
+    # otherwise the row-level diff tells derived caches where the change starts.
+    # With shared=True the frame is swapped for a zero-copy view of the Arrow
+    # file published under token (the content hash by default), unless it is
+    # already such a view. Frame and version are installed as one tuple, so a
+    # reader never pairs the new version with the old frame
+    def _set(self, key, frame, token=None, is_view=False):
+        version = versioning.content_hash(frame) if isinstance(frame, pd.DataFrame) else str(id(frame))
+        current = self._frames.get(key)
+        if current is not None and current[1] == version:
+            return current
+        if self._shared and not is_view and isinstance(frame, pd.DataFrame):
+            frame = arrow_cache.share(key, token or version, frame)
+        if current is not None and isinstance(frame, pd.DataFrame):
+            parent_frame, parent = current
+            since = versioning.first_change(versioning.diff(parent_frame, frame))
+            self._derived.record_change(key, parent, version, since)
+        entry = self._frames[key] = (frame, version)
+        self._drop_dependents(key)
+        return entry
+
+    # Datasets computed from key (and from those, recursively) are recomputed
+    # on their next get, unless the store holds them
+    def _drop_dependents(self, key):
+        for dep in dependents(key):
+            if dep not in self._stored:
+                self._frames.pop(dep, None)
+                self._drop_dependents(dep)
+
+    def version(self, key):
+        return self._entry(key)[1]
+
+    # Value computed from a dataset and cached per dataset version; see versioning.DerivedCache
+    def derived(self, key, name, params, compute, incremental=None):
+        frame, version = self._entry(key)
+        return self._derived.get(
+            key, version, name, params,
+            lambda: compute(frame),
+            incremental and (lambda prev, since: incremental(prev, frame, since)),
+        )
+
+    def _get_stored(self, key, stored_version):
+        if self._stored.get(key) == stored_version:
+            record_cache(key, hit=True)
+            return self._frames[key]
+        with self._key_lock(key):
+            if self._stored.get(key) != stored_version:
+                record_cache(key, hit=False)
+                # Another process may already have mapped this store version
+                token = f"s{stored_version}"
+                with timed("store", key):
+                    view = arrow_cache.open_view(key, token) if self._shared else None
+                    if view is not None:
+                        self._set(key, view, token, is_view=True)
+                    else:
+                        self._set(key, store.read(key), token)
+                self._stored[key] = stored_version
+            else:
+                record_cache(key, hit=True)
+            return self._frames[key]
+
+    def get(self, key):
+        return self._entry(key)[0]
+
+    # (frame, version) of a dataset, loading it on first use
+    def _entry(self, key):
+        stored_version = store.version(key)
+        if stored_version is not None:
+            return self._get_stored(key, stored_version)
+        entry = self._frames.get(key)
+        if entry is not None:
+            record_cache(key, hit=True)
+            return entry
+        with self._key_lock(key):
+            entry = self._frames.get(key)
+            if entry is not None:
+                record_cache(key, hit=True)
+            elif self._bundle is not None and key in self._bundle:
+                record_cache(key, hit=False)
+                with timed("snapshot", key):
+                    entry = self._set(key, self._bundle.load(key))
+                self.refresh(key)
+            else:
+                record_cache(key, hit=False)
+                entry = self._set(key, self._load(key))
+            return entry
+
+    # Reload a dataset from upstream in the background; the current frame keeps
+    # being served until the new one is ready, and is kept if the fetch fails
+    def refresh(self, key):
+        if self._refresher is None:
+            return
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresher.submit(self._refresh, key)
+
+    def _refresh(self, key):
+        try:
+            frame = self._load(key)
+            with self._key_lock(key):
+                self._set(key, frame)
+        except Exception:
+            logger.warning("Background refresh of %s failed; serving snapshot", key, exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._frames.clear()
+                self._stored.clear()
+            else:
+                self._frames.pop(key, None)
+                self._stored.pop(key, None)
+
+
+# One service per server process, shared by every session and page; boots from
+# the latest snapshot bundle when there is one (DASH_OFFLINE=1 skips the refresh).
+# Frames live in memory-mapped Arrow files shared by every process on the host
+# unless DASH_SHARED_CACHE=0
+@st.cache_resource
+def get_service():
+    return DataService(
+        bundle=snapshot.latest_bundle(),
+        refresh=os.environ.get("DASH_OFFLINE") != "1",
+        shared=os.environ.get("DASH_SHARED_CACHE", "1") != "0",
+    )
@@ -0,0 +1,153 @@
+import argparse
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+import data_service
+import forecasting
+import store
+import versioning
+
+logger = logging.getLogger("etl_worker")
+
+# Refresh period in seconds by dataset frequency
+INTERVALS = {"D": 3600, "MS": 6 * 3600, "6MS": 24 * 3600, None: 24 * 3600}
+
+# Per-host exponential backoff after a failed fetch
+BACKOFF_BASE = 60
+BACKOFF_MAX = 3600
+
+
+class Backoff:
+    def __init__(self, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+        self.base = base
+        self.maximum = maximum
+        self.failures = {}
+        self.until = {}
+
+    def blocked(self, host, now):
+        return self.until.get(host, 0) > now
+
+    def failure(self, host, now):
+        n = self.failures.get(host, 0) + 1
+        self.failures[host] = n
+        delay = min(self.maximum, self.base * 2 ** (n - 1))
+        self.until[host] = now + delay * random.uniform(0.8, 1.2)
+        return self.until[host] - now
+
+    def success(self, host):
+        self.failures.pop(host, None)
+        self.until.pop(host, None)
+
+
+# Publish a frame to the store, unless its content and metadata match the
+# latest version (then the dashboards have nothing to reload).
+# Returns (content version, number of changed rows)
+def publish(key, df, start, **meta):
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError(f"{key} is not a DataFrame and cannot be stored")
+    version, changes = versioning.commit(key, df)
+    if changes is None and store.version(key) is not None:
+        stored = store.metadata(key)
+        if all(stored.get(name) == value for name, value in meta.items()):
+            return version, 0
+    spec = data_service.DATASETS[key]
+    store.write(key, df, host=spec["host"], freq=spec["freq"], version=version,
+                seconds=round(time.perf_counter() - start, 3), **meta)
+    return version, len(changes) if changes is not None else len(df)
+
+
+# Load one dataset from upstream and publish it together with the datasets
+# computed from it (e.g. its seasonal decomposition), so pages never compute
+# them on a click. A dependent is derived again whenever the source version it
+# was built from differs from the current one, so one that failed is retried
+# on the next run; its failure is logged and does not count against the host.
+# Returns the number of changed rows of the source
+def refresh(key):
+    start = time.perf_counter()
+    df = data_service.load_dataset(key)
+    version, rows = publish(key, df, start)
+    publish_dependents(key, df, version)
+    return rows
+
+
+# Derive and publish the datasets computed from key, and recursively those
+# computed from them (e.g. the forecasts of headline inflation)
+def publish_dependents(key, df, version):
+    for dep in data_service.dependents(key):
+        try:
+            if store.version(dep) is not None and store.metadata(dep).get("source_version") == version:
+                dep_df, dep_version = None, store.metadata(dep)["version"]
+            else:
+                start = time.perf_counter()
+                dep_df = data_service.derive(dep, df)
+                dep_version, _ = publish(dep, dep_df, start, source_version=version)
+        except Exception:
+            logger.warning("Could not derive %s from %s; retrying on the next refresh", dep, key, exc_info=True)
+            continue
+        if data_service.dependents(dep):
+            publish_dependents(dep, dep_df if dep_df is not None else store.read(dep), dep_version)
+
+
+# Datasets with an upstream host; local-only ones (e.g. the forecast models) are skipped
+def default_keys():
+    return [key for key, spec in data_service.DATASETS.items() if spec["host"] is not None]
+
+
+def run(keys, workers=4, once=False, interval=None):
+    backoff = Backoff()
+    due = {key: 0.0 for key in keys}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etl") as pool:
+        while True:
+            now = time.time()
+            for key, at in sorted(due.items(), key=lambda item: item[1]):
+                host = data_service.DATASETS[key]["host"]
+                if at <= now and key not in running.values() and not backoff.blocked(host, now):
+                    running[pool.submit(refresh, key)] = key
+                    due[key] = float("inf")
+
+            if not running:
+                if once and all(at == float("inf") for at in due.values()):
+                    return
+                time.sleep(max(0.5, min(min(due.values()) - time.time(), 60)))
+                continue
+
+            done, _ = wait(list(running), timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                spec = data_service.DATASETS[key]
+                now = time.time()
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    delay = backoff.failure(spec["host"], now)
+                    logger.warning("%s failed (%s); %s backing off %.0fs", key, e, spec["host"], delay)
+                    due[key] = now + delay
+                    if once and backoff.failures[spec["host"]] > 3:
+                        due[key] = float("inf")
+                else:
+                    backoff.success(spec["host"])
+                    logger.info("%s refreshed (%d rows changed)", key, rows)
+                    due[key] = float("inf") if once else now + (interval or INTERVALS.get(spec["freq"], INTERVALS[None]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh every upstream dataset into the local store read by the dashboards")
+    parser.add_argument("--dataset", action="append", dest="keys", help="dataset key (repeatable, default: all)")
+    parser.add_argument("--workers", type=int, default=4, help="maximum concurrent fetches")
+    parser.add_argument("--interval", type=float, help="refresh period in seconds for every dataset (default: by frequency)")
+    parser.add_argument("--once", action="store_true", help="refresh everything once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    forecasting.use_pool()
+    run(args.keys or default_keys(), workers=args.workers, once=args.once, interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
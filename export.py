@@ -0,0 +1,155 @@
+import hashlib
+import io
+import glob
+import os
+import threading
+import zipfile
+
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+import store
+import versioning
+
+# Export formats: label -> (extension, MIME type)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+# Rows serialized per chunk / Parquet row group
+CHUNK_ROWS = 50_000
+# Bulk archives are cached on disk per data version and format
+EXPORT_DIR = os.path.join(store.STORE_DIR, "exports")
+
+# Aggregations offered for each indicator: label -> resample rule (None keeps the raw series)
+DAILY_FREQUENCIES = {"Diaria": None, "Semanal": "W", "Mensual": "ME", "Trimestral": "QE", "Anual": "YE"}
+MONTHLY_FREQUENCIES = {"Mensual": None, "Trimestral": "QE", "Anual": "YE"}
+
+
+# How each series is aggregated: trade balance flows are summed, the IMAEP
+# activity index is averaged and stock series keep the last observation
+AGGREGATIONS = {"bc": "sum", "actividad": "mean"}
+
+
+# Monthly rates (inflation, IPC openings) and semiannual poverty are only
+# offered as published
+def frequencies(key):
+    if key in ("bc", "actividad"):
+        return MONTHLY_FREQUENCIES
+    if key in ("inflacion", "pobreza", "ipc_aperturas", "infla"):
+        return {"Original": None}
+    return DAILY_FREQUENCIES
+
+
+def resample(df, key, aggregation):
+    rule = frequencies(key)[aggregation]
+    if rule is None:
+        return df
+    return getattr(df.resample(rule), AGGREGATIONS.get(key, "last"))()
+
+
+# Patch a previous resample of an older version from the first changed row on
+def resample_since(prev, df, since, key, aggregation):
+    rule = frequencies(key)[aggregation]
+    if rule is None:
+        return df
+    return versioning.resample_incremental(prev, df, since, rule, AGGREGATIONS.get(key, "last"))
+
+
+# Date-range slice of a series resampled over its full history; the bin that
+# contains the end date is kept even though its label falls after it
+def slice_resampled(df, key, aggregation, start, end):
+    rule = frequencies(key)[aggregation]
+    if rule is not None:
+        end = to_offset(rule).rollforward(end)
+    return df.loc[start:end]
+
+
+def write_csv(df, f):
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        df.iloc[start:start + CHUNK_ROWS].to_csv(text, header=start == 0)
+    text.flush()
+    text.detach()
+
+
+def write_parquet(df, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = df.copy(deep=False)
+    df.columns = df.columns.map(str)
+    writer = None
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        table = pa.Table.from_pandas(df.iloc[start:start + CHUNK_ROWS])
+        if writer is None:
+            writer = pq.ParquetWriter(f, table.schema, compression="zstd")
+        writer.write_table(table)
+    writer.close()
+
+
+def write_xlsx(df, f):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("datos")
+    ws.append([df.index.name or "fecha"] + [str(c) for c in df.columns])
+    for row in df.itertuples(name=None):
+        ws.append([row[0].to_pydatetime() if isinstance(row[0], pd.Timestamp) else row[0]] + list(row[1:]))
+    wb.save(f)
+
+
+WRITERS = {"CSV": write_csv, "Parquet": write_parquet, "Excel": write_xlsx}
+
+
+# Serialize one frame on demand (called from a button click, never on every rerun)
+def export_frame(df, fmt):
+    buffer = io.BytesIO()
+    WRITERS[fmt](df, buffer)
+    return buffer.getvalue()
+
+
+def file_name(base, fmt):
+    return f"{base}.{FORMATS[fmt][0]}"
+
+
+# Archive name from the content hash of every dataset version in it
+def _fingerprint(versions):
+    digest = hashlib.sha1()
+    for key, version in sorted(versions.items()):
+        digest.update(f"{key}={version};".encode())
+    return digest.hexdigest()[:16]
+
+
+_lock = threading.Lock()
+
+
+def _archive_path(fingerprint, fmt):
+    return os.path.join(EXPORT_DIR, f"series-{fingerprint}.{FORMATS[fmt][0]}.zip")
+
+
+# Zip with every indicator x frequency, built from the shared data service and
+# streamed entry by entry to disk; rebuilt only when some dataset changed, and
+# the archives of older versions in the same format are then deleted
+def bulk_archive(service, keys, fmt):
+    frames = {key: service.get(key) for key in keys}
+    versions = {key: service.version(key) for key in keys}
+    path = _archive_path(_fingerprint(versions), fmt)
+    with _lock:
+        if not os.path.exists(path):
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for key, df in frames.items():
+                    for aggregation in frequencies(key):
+                        with zf.open(file_name(f"{key}_{aggregation.lower()}", fmt), "w") as entry:
+                            WRITERS[fmt](resample(df, key, aggregation), entry)
+            os.replace(tmp, path)
+            for old in glob.glob(_archive_path("*", fmt)):
+                if old != path:
+                    try:
+                        os.remove(old)
+                    except OSError:
+                        pass
+    return path
@@ -0,0 +1,279 @@
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+import store
+
+# Batch forecasts for every published indicator, refreshed with the data. Each
+# column is fitted with a damped-trend exponential smoothing model (ETS) and an
+# AR model on first differences (ARIMA(p,1,0)); the one with the smaller
+# one-step error is kept. Strictly positive series are modelled in logs
+HORIZONS = {"D": 60, "MS": 12, "6MS": 4}
+HISTORY = {"D": 750}  # daily series are fitted on their most recent observations
+MIN_OBS = 12
+MAX_AR = {"D": 10, "MS": 12, "6MS": 2}
+Z = 1.96  # 95% intervals
+COMPONENTS = ["Pronóstico", "Inferior", "Superior"]
+
+# Last fitted parameters per dataset, used to warm-start the next refresh
+PARAMS_DIR = os.path.join(store.STORE_DIR, "forecast_params")
+
+# Columns are fitted in a process pool above this many series, in processes
+# that enabled it with use_pool() (the ETL worker); the Streamlit server fits
+# in-process so a click never starts worker processes
+PARALLEL_MIN = 8
+
+# ETS search: a coarse grid on a cold start, then local refinement around the
+# best (or the previous) parameters with a shrinking step
+ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+BETA_RATIOS = (0.0, 0.05, 0.15, 0.4)  # slope smoothing as a fraction of alpha
+PHIS = (0.8, 0.9, 0.95, 0.98)
+BOUNDS = np.array([[0.01, 0.999], [0.0, 0.999], [0.7, 0.995]])
+REFINE_STEPS = (0.05, 0.02, 0.005)
+
+_pool = None
+_pool_lock = threading.Lock()
+_parallel = False
+
+
+# One-step errors of damped Holt in error-correction form for m parameter sets
+# at once; params is (m, 3) of alpha, beta, phi. Returns (sse, final level, final slope)
+def _ets_filter(y, params):
+    alpha, beta, phi = params[:, 0], params[:, 1], params[:, 2]
+    level = np.full(len(params), y[0])
+    slope = np.full(len(params), y[1] - y[0])
+    sse = np.zeros(len(params))
+    for value in y[1:]:
+        step = level + phi * slope
+        err = value - step
+        sse += err * err
+        level = step + alpha * err
+        slope = phi * slope + beta * err
+    return sse, level, slope
+
+
+def _ets_grid():
+    return np.array([(a, a * r, p) for a in ALPHAS for r in BETA_RATIOS for p in PHIS])
+
+
+def _ets_fit(y, start=None):
+    if start is None:
+        sse, _, _ = _ets_filter(y, _ets_grid())
+        best = _ets_grid()[np.argmin(sse)]
+    else:
+        best = np.clip(np.asarray(start, dtype=float), BOUNDS[:, 0], BOUNDS[:, 1])
+    offsets = np.array(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1])).reshape(3, -1).T
+    for step in REFINE_STEPS:
+        candidates = np.clip(best + offsets * step, BOUNDS[:, 0], BOUNDS[:, 1])
+        sse, _, _ = _ets_filter(y, candidates)
+        best = candidates[np.argmin(sse)]
+    sse, level, slope = _ets_filter(y, best[None, :])
+    return best, float(np.sqrt(sse[0] / (len(y) - 1))), level[0], slope[0]
+
+
+# Point path and h-step standard errors of the damped trend model
+def _ets_forecast(params, sigma, level, slope, horizon):
+    alpha, beta, phi = params
+    damp = np.cumsum(phi ** np.arange(1, horizon + 1))
+    mean = level + damp * slope
+    c = alpha + beta * damp[:-1]
+    se = sigma * np.sqrt(1 + np.r_[0, np.cumsum(c * c)])
+    return mean, se
+
+
+# AR(p) with intercept on differences by least squares, over a common sample
+# so orders are comparable; returns (coef, sigma, aic)
+def _ar_ols(d, p, skip):
+    X = np.column_stack([np.ones(len(d) - skip)] + [d[skip - i:len(d) - i] for i in range(1, p + 1)])
+    target = d[skip:]
+    coef, *_ = np.linalg.lstsq(X, target, rcond=None)
+    resid = target - X @ coef
+    var = resid @ resid / len(target)
+    return coef, float(np.sqrt(var)), len(target) * np.log(var) + 2 * (p + 1)
+
+
+# The previous order is reused on a warm start; otherwise it is chosen by AIC
+def _ar_fit(y, max_order, order=None):
+    d = np.diff(y)
+    max_order = max(1, min(max_order, len(d) // 4))
+    if order is not None and order <= max_order:
+        coef, sigma, _ = _ar_ols(d, order, order)
+        return order, coef, sigma
+    fits = [(p,) + _ar_ols(d, p, max_order) for p in range(1, max_order + 1)]
+    p, _, _, _ = min(fits, key=lambda fit: fit[3])
+    coef, sigma, _ = _ar_ols(d, p, p)
+    return p, coef, sigma
+
+
+def _ar_forecast(y, order, coef, sigma, horizon):
+    d = list(np.diff(y)[-order:])
+    steps = []
+    for _ in range(horizon):
+        steps.append(coef[0] + sum(coef[i] * d[-i] for i in range(1, order + 1)))
+        d.append(steps[-1])
+    mean = y[-1] + np.cumsum(steps)
+    # psi weights of the differences, accumulated for the level
+    psi = np.zeros(horizon)
+    psi[0] = 1.0
+    for j in range(1, horizon):
+        psi[j] = sum(coef[i] * psi[j - i] for i in range(1, min(order, j) + 1))
+    se = sigma * np.sqrt(np.cumsum(np.cumsum(psi) ** 2))
+    return mean, se
+
+
+# Fit one series and forecast horizon steps ahead. prev holds the parameters of
+# the previous fit of the same series (warm start); returns (mean, lower, upper, params)
+def fit_series(values, horizon, max_order, prev=None):
+    prev = prev or {}
+    y = np.asarray(values, dtype=float)
+    log = bool(np.all(y > 0))
+    if log:
+        y = np.log(y)
+
+    ets, ets_sigma, level, slope = _ets_fit(y, prev.get("ets"))
+    order, coef, ar_sigma = _ar_fit(y, max_order, prev.get("ar"))
+    if ets_sigma <= ar_sigma:
+        model = "ETS"
+        mean, se = _ets_forecast(ets, ets_sigma, level, slope, horizon)
+    else:
+        model = "ARIMA"
+        mean, se = _ar_forecast(y, order, coef, ar_sigma, horizon)
+
+    lower, upper = mean - Z * se, mean + Z * se
+    if log:
+        mean, lower, upper = np.exp(mean), np.exp(lower), np.exp(upper)
+    params = {"model": model, "log": log, "ets": [round(float(v), 4) for v in ets], "ar": order}
+    return mean, lower, upper, params
+
+
+# Worker task: fit a batch of (name, values) series
+def _fit_batch(batch, horizon, max_order, prev):
+    return [(name,) + fit_series(values, horizon, max_order, prev.get(name)) for name, values in batch]
+
+
+def use_pool(enabled=True):
+    global _parallel
+    _parallel = enabled
+
+
+# Spawned (not forked) so the pool is safe to start from a threaded process
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+# A pool whose worker died is unusable; drop it so the next call starts a new one
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Fit the batch in chunks across the pool, retrying once on a fresh pool if a
+# worker dies
+def _fit_parallel(batch, horizon, max_order, prev):
+    size = -(-len(batch) // (os.cpu_count() or 1))
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(_fit_batch, batch[i:i + size], horizon, max_order, prev)
+                       for i in range(0, len(batch), size)]
+            return [r for future in futures for r in future.result()]
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            if attempt:
+                raise
+
+
+def _params_path(name):
+    return os.path.join(PARAMS_DIR, f"{name}.json")
+
+
+def load_params(name):
+    try:
+        with open(_params_path(name)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_params(name, params):
+    os.makedirs(PARAMS_DIR, exist_ok=True)
+
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(params, f, indent=1, sort_keys=True)
+
+    store.atomic_write(_params_path(name), write)
+
+
+# Future dates after the last observation; daily series without weekends
+# continue on business days
+def _future(index, step, horizon):
+    last = index[-1]
+    if step == "D" and not (index[-HISTORY["D"]:].dayofweek >= 5).any():
+        step = "B"
+    return pd.date_range(last, periods=horizon + 1, freq=step)[1:]
+
+
+# Forecast every column of a dataset. name keys the warm-start parameters and
+# step is the dataset frequency. Columns become (Categoría, Componente) over the
+# forecast dates; series too short to fit are left out
+def forecast_frame(df, name, step):
+    horizon = HORIZONS[step]
+    history = HISTORY.get(step)
+    prev = load_params(name)
+
+    series = {}
+    for column in df.columns:
+        s = pd.to_numeric(df[column], errors="coerce").dropna()
+        if history:
+            s = s.iloc[-history:]
+        if len(s) >= MIN_OBS and isinstance(s.index, pd.DatetimeIndex):
+            series[str(column)] = s
+
+    batch = [(label, s.to_numpy(dtype=float)) for label, s in series.items()]
+    if _parallel and len(batch) >= PARALLEL_MIN:
+        results = _fit_parallel(batch, horizon, MAX_AR[step], prev)
+    else:
+        results = _fit_batch(batch, horizon, MAX_AR[step], prev)
+
+    parts = {}
+    params = {}
+    for label, mean, lower, upper, fitted in results:
+        dates = _future(series[label].index, step, horizon)
+        for component, values in zip(COMPONENTS, (mean, lower, upper)):
+            parts[(label, component)] = pd.Series(values, index=dates)
+        params[label] = fitted
+    _save_params(name, params)
+
+    columns = pd.MultiIndex.from_tuples(list(parts), names=["Categoría", "Componente"]) if parts else \
+        pd.MultiIndex.from_arrays([[], []], names=["Categoría", "Componente"])
+    frame = pd.DataFrame(parts, columns=columns) if parts else pd.DataFrame(columns=columns, index=pd.DatetimeIndex([]))
+    frame.index.name = "fecha"
+    return frame
+
+
+# Overlay the forecast of one column on a plotly figure: dashed path and a
+# shaded interval
+def overlay(fig, forecast, column, name="Pronóstico"):
+    column = str(column)
+    if forecast is None or column not in forecast.columns.get_level_values("Categoría"):
+        return fig
+    f = forecast[column].dropna()
+    fig.add_scatter(x=f.index, y=f["Superior"], mode="lines", line={"width": 0}, showlegend=False, hoverinfo="skip")
+    fig.add_scatter(x=f.index, y=f["Inferior"], mode="lines", line={"width": 0}, fill="tonexty",
+                    fillcolor="rgba(99, 110, 250, 0.2)", name="Intervalo 95%")
+    fig.add_scatter(x=f.index, y=f["Pronóstico"], mode="lines", line={"dash": "dash"}, name=name)
+    return fig
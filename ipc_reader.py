@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import xlrd
+
+# sh_ipc_aperturas.xls is parsed in one pass into every opening (xlrd decodes
+# the whole sheet on open anyway); single series are then selected from that
+# frame by the labels printed in the workbook instead of row numbers:
+# column -> (section, row label). A section is a row with a label and no values
+# (e.g. "Total nacional", "Región GBA").
+IPC_SPEC = {
+    "Inflación Mensual (%)": ("Total nacional", "Nivel general"),
+}
+
+
+def _clean(label):
+    return " ".join(str(label).split())
+
+
+def _open_sheet(content, sheet):
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    return book, book.sheet_by_index(sheet)
+
+
+# Row of period headers: the first row whose value cells are Excel dates
+def _find_date_row(sheet):
+    for r in range(sheet.nrows):
+        types = sheet.row_types(r, start_colx=1)
+        if any(t == xlrd.XL_CELL_DATE for t in types):
+            return r
+    raise ValueError("No date header row found in IPC sheet")
+
+
+def _dates(book, sheet, row):
+    dates = []
+    for cell in sheet.row_slice(row, start_colx=1):
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            dates.append(xlrd.xldate_as_datetime(cell.value, book.datemode))
+        else:
+            dates.append(pd.to_datetime(cell.value, errors="coerce") if cell.value != "" else pd.NaT)
+    return pd.DatetimeIndex(dates)
+
+
+def _values(sheet, row, width):
+    cells = sheet.row_slice(row, start_colx=1, end_colx=1 + width)
+    return np.array([c.value if c.ctype == xlrd.XL_CELL_NUMBER else np.nan for c in cells], dtype=float)
+
+
+# Walk the label column once, yielding (section, label, row) for every data row.
+# The date header row may itself carry the first section label
+def _index_rows(sheet, start):
+    section = _clean(sheet.cell_value(start, 0)) or None
+    labels = sheet.col_values(0, start_rowx=start + 1)
+    for offset, label in enumerate(labels):
+        r = start + 1 + offset
+        label = _clean(label)
+        if not label:
+            continue
+        types = sheet.row_types(r, start_colx=1)
+        if not any(t == xlrd.XL_CELL_NUMBER for t in types):
+            section = label
+            continue
+        yield section, label, r
+
+
+def _frame(columns, index):
+    df = pd.DataFrame(columns, index=index)
+    return df[df.index.notna()].dropna(how="all")
+
+
+# Every opening (section x label) of the sheet in one pass, as MultiIndex columns
+def read_ipc_openings(content, sheet=0):
+    book, ws = _open_sheet(content, sheet)
+    try:
+        date_row = _find_date_row(ws)
+        dates = _dates(book, ws, date_row)
+        columns = {}
+        for section, label, r in _index_rows(ws, date_row):
+            columns.setdefault((section, label), _values(ws, r, len(dates)))
+        df = _frame(columns, dates)
+        df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Región", "Apertura"])
+        return df
+    finally:
+        book.release_resources()
+
+
+# The series named in spec out of an already parsed read_ipc_openings frame
+def select_series(openings, spec=IPC_SPEC):
+    columns = {}
+    for name, (section, label) in spec.items():
+        key = (_clean(section), _clean(label))
+        if key not in openings.columns:
+            raise KeyError(f"IPC series not found: {name}")
+        columns[name] = openings[key]
+    return pd.DataFrame(columns).dropna(how="all")
@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import replay
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Seconds to wait for a freshly started server to answer its health check
+STARTUP_TIMEOUT = 60
+
+
+def _parse_date(value):
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unable to parse date: {value}")
+
+
+# One browser tab on a running `streamlit run` server, speaking the same
+# protobuf-over-websocket protocol as the frontend: every interaction sends a
+# rerun with the current widget states and waits for the script to finish
+class Session:
+    def __init__(self, url, page, timeout):
+        self.url = url.rstrip("/")
+        self.page = page
+        self.timeout = timeout
+        self.ws = None
+        self.widgets = {}  # (kind, label) -> (element proto, fragment id)
+        self.states = {}  # widget id -> WidgetState sent on every rerun
+        self.bytes = 0
+
+    async def connect(self):
+        import websockets
+
+        stream = self.url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.ws = await websockets.connect(stream, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def widget(self, kind, label):
+        return self.widgets.get((kind, label))
+
+    def set_state(self, element, **value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=element.id, **value)
+        self.states[element.id] = state
+
+    # Full rerun, or only the fragment that holds the widget that changed
+    async def rerun(self, fragment_id="", trigger=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        msg = BackMsg()
+        client = msg.rerun_script
+        client.page_name = self.page
+        client.fragment_id = fragment_id
+        for state in self.states.values():
+            client.widget_states.widgets.add().CopyFrom(state)
+        if trigger is not None:
+            client.widget_states.widgets.add().CopyFrom(WidgetState(id=trigger.id, trigger_value=True))
+        await self.ws.send(msg.SerializeToString())
+
+        seen = {}
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), self.timeout)
+            self.bytes += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    raise RuntimeError(element.exception.message)
+                if element_kind in ("selectbox", "date_input", "button", "download_button", "checkbox"):
+                    proto = getattr(element, element_kind)
+                    seen[(element_kind, proto.label)] = (proto, fwd.delta.fragment_id)
+            elif kind == "script_finished":
+                status = fwd.script_finished
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError(f"{self.page}: script failed to compile")
+                if status != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+
+        # A fragment run only redraws its own widgets
+        if fragment_id:
+            self.widgets.update(seen)
+        else:
+            self.widgets = seen
+        ids = {proto.id for proto, _ in self.widgets.values()}
+        self.states = {wid: state for wid, state in self.states.items() if wid in ids}
+
+    # Fetch a file the way the browser does when a download button is clicked
+    def download(self, element):
+        with urllib.request.urlopen(self.url + element.url, timeout=self.timeout) as response:
+            self.bytes += len(response.read())
+
+
+# Selectboxes are sent by option label on current Streamlit and by index on
+# releases whose Selectbox proto predates raw_value
+def _select(label):
+    async def step(session, rng):
+        found = session.widget("selectbox", label)
+        if found is None or not found[0].options:
+            return False
+        element, fragment_id = found
+        index = rng.randrange(len(element.options))
+        if "raw_value" in element.DESCRIPTOR.fields_by_name:
+            session.set_state(element, string_value=element.options[index])
+        else:
+            session.set_state(element, int_value=index)
+        await session.rerun(fragment_id)
+        return True
+    return step
+
+
+def _date_range(label):
+    async def step(session, rng):
+        found = session.widget("date_input", label)
+        if found is None or len(found[0].default) < 2:
+            return False
+        element, fragment_id = found
+        start, end = (_parse_date(v) for v in element.default[:2])
+        days = (end - start).days
+        if days <= 1:
+            return False
+        new_start = start + timedelta(days=rng.randrange(days))
+        session.set_state(element, string_array_value={"data": [new_start.strftime("%Y/%m/%d"), end.strftime("%Y/%m/%d")]})
+        await session.rerun(fragment_id)
+        return True
+    return step
+
+
+# "Preparar descarga", then the download button it renders: the file is
+# fetched from the media endpoint and the click is sent back like the browser does
+def _export(button_label):
+    async def step(session, rng):
+        found = session.widget("button", button_label)
+        if found is None:
+            return False
+        element, fragment_id = found
+        await session.rerun(fragment_id, trigger=element)
+        downloads = [w for (kind, _), w in session.widgets.items() if kind == "download_button"]
+        if not downloads:
+            return False
+        download, fragment_id = downloads[0]
+        await asyncio.to_thread(session.download, download)
+        if not download.ignore_rerun:
+            await session.rerun(fragment_id, trigger=download)
+        return True
+    return step
+
+
+# Widget sequences a real user goes through on each page
+SCENARIOS = {
+    "reservas": [
+        ("indicador", _select("Seleccionar Indicador")),
+        ("rango", _date_range("Seleccionar Rango de Fechas")),
+        ("agregacion", _select("Seleccionar Unidad de Tiempo")),
+        ("transformacion", _select("Ver Tipo de Serie")),
+        ("export", _export("Preparar descarga")),
+    ],
+    "paraguay": [
+        ("indicador", _select("Seleccionar Indicador")),
+        ("rango", _date_range("Seleccionar Rango de Fechas")),
+        ("categoria", _select("Seleccionar categoría")),
+    ],
+    "inmobiliario": [
+        ("tipo", _select("Tipo de propiedad")),
+        ("subtipo", _select("Tipo específico")),
+        ("grafico", _select("¿Qué querés visualizar?")),
+    ],
+}
+
+
+# One simulated browser session: open the page, then walk the scenario. The
+# connection stays open until every session is done, like open browser tabs
+async def run_session(url, page, iterations, seed, timeout, barrier):
+    rng = random.Random(seed)
+    samples = []
+    session = Session(url, page, timeout)
+    try:
+        await session.connect()
+        start = time.perf_counter()
+        await session.rerun()
+        samples.append(("inicio", time.perf_counter() - start))
+        for _ in range(iterations):
+            for name, step in SCENARIOS[page]:
+                start = time.perf_counter()
+                if await step(session, rng):
+                    samples.append((name, time.perf_counter() - start))
+        await barrier.wait()
+    except asyncio.BrokenBarrierError:
+        pass
+    except BaseException:
+        await barrier.abort()
+        raise
+    finally:
+        await session.close()
+    return samples, session.bytes
+
+
+async def run_sessions(url, page, sessions, iterations, timeout):
+    barrier = asyncio.Barrier(sessions)
+    return await asyncio.gather(*[
+        run_session(url, page, iterations, seed, timeout, barrier) for seed in range(sessions)
+    ])
+
+
+# Resident memory of a process in bytes (Linux /proc), None where unavailable
+def rss(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# Polls the server's RSS in the background and keeps the maximum
+class RssMonitor:
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss(self.pid) or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# `streamlit run app.py` in its own process, headless and without XSRF checks
+# so the websocket clients can connect without a browser cookie. Its log goes
+# to an unlinked temporary file: a pipe nobody reads would fill up and block
+# the server on its next warning
+def start_server(port, env):
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", APP,
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--server.enableXsrfProtection", "false",
+        "--browser.gatherUsageStats", "false",
+    ]
+    with tempfile.TemporaryFile() as log:
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=log)
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.time() + STARTUP_TIMEOUT
+        while time.time() < deadline:
+            if proc.poll() is not None:
+                log.seek(0)
+                raise RuntimeError(f"streamlit exited: {log.read().decode(errors='replace')[-2000:]}")
+            try:
+                with urllib.request.urlopen(url + "/_stcore/health", timeout=1):
+                    return proc, url
+            except OSError:
+                time.sleep(0.25)
+        proc.terminate()
+        raise RuntimeError(f"streamlit did not answer on {url} within {STARTUP_TIMEOUT}s")
+
+
+def report(samples, elapsed, sessions, received, memory):
+    latencies = np.array([s for _, s in samples])
+    print(f"\n{sessions} sesiones, {len(latencies)} reruns en {elapsed:.1f}s "
+          f"({len(latencies) / elapsed:.1f} reruns/s), {received / 2**20:.1f} MB recibidos")
+    print(f"{'paso':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    steps = sorted({name for name, _ in samples})
+    for name in steps + ["total"]:
+        values = latencies if name == "total" else np.array([s for n, s in samples if n == name])
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+        print(f"{name:<16}{len(values):>6}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+    if memory is not None:
+        baseline, peak = memory
+        print(f"\nMemoria del servidor (RSS): base {baseline / 2**20:.0f} MB con los datasets cargados, "
+              f"pico {peak / 2**20:.0f} MB, "
+              f"{max(peak - baseline, 0) / 2**20 / sessions:.2f} MB por sesión por encima de la base")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive N concurrent websocket sessions through a dashboard page of a real Streamlit server")
+    parser.add_argument("--page", choices=list(SCENARIOS), default="reservas")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5, help="scenario repetitions per session")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per rerun")
+    parser.add_argument("--url", help="load an already running server instead of starting one (no memory figures)")
+    parser.add_argument("--server-port", type=int, default=8599, help="port of the server started for the test")
+    parser.add_argument("--version", help="fixture version to replay (default: latest)")
+    parser.add_argument("--latency", type=float, default=0.0, help="replayed upstream latency, seconds")
+    parser.add_argument("--port", type=int, default=8765, help="replay server port")
+    parser.add_argument("--live", action="store_true", help="hit the real upstream sources instead of the replay server")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        env = dict(os.environ, METRICS_PORT=str(args.server_port + 1))
+        if not args.live:
+            version = args.version or replay.latest_version()
+            config = replay.ReplayConfig(os.path.join(replay.FIXTURES_DIR, version), latency=args.latency)
+            replay.serve(config, args.port)
+            env["DASH_REPLAY_URL"] = f"http://127.0.0.1:{args.port}"
+        proc, url = start_server(args.server_port, env)
+
+    try:
+        # A first session loads the datasets, so the baseline is the server
+        # with its shared data and per-session memory is what each tab adds
+        asyncio.run(run_sessions(url, args.page, 1, 1, args.timeout))
+        baseline = rss(proc.pid) if proc is not None else None
+
+        with RssMonitor(proc.pid) if proc is not None else nullcontext() as monitor:
+            start = time.perf_counter()
+            results = asyncio.run(run_sessions(url, args.page, args.sessions, args.iterations, args.timeout))
+            elapsed = time.perf_counter() - start
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    samples = [sample for session_samples, _ in results for sample in session_samples]
+    received = sum(n for _, n in results)
+    memory = (baseline, monitor.peak) if baseline is not None and monitor is not None else None
+    report(samples, elapsed, args.sessions, received, memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import errno
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram buckets in seconds (Prometheus "le" bounds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_latency = {}  # (stage, source) -> [bucket counts..., +Inf count, sum]
+_payload_bytes = {}  # source -> total bytes downloaded
+_cache = {}  # dataset -> [hits, misses]
+
+
+# Record one latency observation for a pipeline stage
+def observe(stage, source, seconds):
+    with _lock:
+        hist = _latency.get((stage, source))
+        if hist is None:
+            hist = _latency[(stage, source)] = [0] * (len(BUCKETS) + 1) + [0.0]
+        hist[bisect_left(BUCKETS, seconds)] += 1
+        hist[-1] += seconds
+
+
+def record_bytes(source, n):
+    with _lock:
+        _payload_bytes[source] = _payload_bytes.get(source, 0) + n
+
+
+def record_cache(dataset, hit):
+    with _lock:
+        counts = _cache.setdefault(dataset, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+# Context manager timing a block: with timed("parse", "inflacion"): ...
+@contextmanager
+def timed(stage, source=""):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, source, time.perf_counter() - start)
+
+
+# Decorator version of timed() for loaders and transforms
+def instrumented(stage, source=""):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage, source or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Approximate quantile from the cumulative bucket counts
+def _quantile(hist, q):
+    total = sum(hist[:-1])
+    if total == 0:
+        return float("nan")
+    rank = q * total
+    running = 0
+    for bound, count in zip(BUCKETS + (float("inf"),), hist[:-1]):
+        running += count
+        if running >= rank:
+            return bound
+    return float("inf")
+
+
+# Summary table for the in-app debug panel
+def snapshot():
+    with _lock:
+        latency = {key: list(hist) for key, hist in _latency.items()}
+        payload = dict(_payload_bytes)
+        cache = {key: list(counts) for key, counts in _cache.items()}
+    rows = []
+    for (stage, source), hist in sorted(latency.items()):
+        count = sum(hist[:-1])
+        rows.append({
+            "stage": stage,
+            "source": source,
+            "count": count,
+            "mean_ms": 1000 * hist[-1] / count,
+            "p95_ms": 1000 * _quantile(hist, 0.95),
+            "bytes": payload.get(source, 0) if stage == "fetch" else None,
+        })
+    cache_rows = [
+        {"dataset": key, "hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses)}
+        for key, (hits, misses) in sorted(cache.items())
+    ]
+    return pd.DataFrame(rows), pd.DataFrame(cache_rows)
+
+
+# Prometheus text exposition format (version 0.0.4)
+def render_prometheus():
+    with _lock:
+        latency = {key: list(hist) for key, hist in _latency.items()}
+        payload = dict(_payload_bytes)
+        cache = {key: list(counts) for key, counts in _cache.items()}
+    lines = [
+        "# HELP dash_stage_latency_seconds Latency of each loader and transform stage.",
+        "# TYPE dash_stage_latency_seconds histogram",
+    ]
+    for (stage, source), hist in sorted(latency.items()):
+        labels = f'stage="{stage}",source="{source}"'
+        running = 0
+        for bound, count in zip(BUCKETS, hist):
+            running += count
+            lines.append(f'dash_stage_latency_seconds_bucket{{{labels},le="{bound}"}} {running}')
+        running += hist[len(BUCKETS)]
+        lines.append(f'dash_stage_latency_seconds_bucket{{{labels},le="+Inf"}} {running}')
+        lines.append(f"dash_stage_latency_seconds_sum{{{labels}}} {hist[-1]}")
+        lines.append(f"dash_stage_latency_seconds_count{{{labels}}} {running}")
+    lines += [
+        "# HELP dash_payload_bytes_total Bytes downloaded from each upstream source.",
+        "# TYPE dash_payload_bytes_total counter",
+    ]
+    for source, n in sorted(payload.items()):
+        lines.append(f'dash_payload_bytes_total{{source="{source}"}} {n}')
+    lines += [
+        "# HELP dash_cache_requests_total Data service lookups by result.",
+        "# TYPE dash_cache_requests_total counter",
+    ]
+    for dataset, (hits, misses) in sorted(cache.items()):
+        lines.append(f'dash_cache_requests_total{{dataset="{dataset}",result="hit"}} {hits}')
+        lines.append(f'dash_cache_requests_total{{dataset="{dataset}",result="miss"}} {misses}')
+    lines += [
+        "# HELP dash_cache_hit_ratio Share of data service lookups served from memory.",
+        "# TYPE dash_cache_hit_ratio gauge",
+    ]
+    for dataset, (hits, misses) in sorted(cache.items()):
+        lines.append(f'dash_cache_hit_ratio{{dataset="{dataset}"}} {hits / (hits + misses)}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serve /metrics from a daemon thread next to the Streamlit server. When the
+# port is taken (e.g. by another server process on the same host) the app keeps
+# running without the endpoint; give each process its own METRICS_PORT
+def start_server(port, host="0.0.0.0"):
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        if e.errno != errno.EADDRINUSE:
+            raise
+        logger.warning("Metrics port %d is already in use; /metrics is disabled in this process", port)
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Optional sidebar panel with the same numbers as /metrics
+def debug_panel():
+    latency, cache = snapshot()
+    with st.sidebar.expander("⏱️ Métricas", expanded=True):
+        st.markdown("**Latencia por etapa**")
+        st.dataframe(latency.round(1), hide_index=True)
+        st.markdown("**Cache del servicio de datos**")
+        st.dataframe(cache.round(3), hide_index=True)
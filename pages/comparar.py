@@ -0,0 +1,94 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+import alignment
+import charts
+import export
+from data_service import DATASETS, get_service, indicators
+from metrics import timed
+
+service = get_service()
+
+# Streamlit UI
+st.title("📊 Comparar Indicadores - BCRA & INDEC")
+
+# Dictionary mapping variable names to their dataset keys
+variable_dict = indicators("bcra_indec")
+
+# User selection; only this selector reruns the data-loading path
+selected_variables = st.multiselect(
+    "Seleccionar Indicadores",
+    list(variable_dict.keys()),
+    default=list(variable_dict.keys())[:2],
+)
+if not selected_variables:
+    st.info("Seleccioná al menos un indicador.")
+    st.stop()
+
+# Fetch the first column of every selected dataset
+series = {label: service.get(variable_dict[label]).iloc[:, 0].astype(float) for label in selected_variables}
+
+
+# Calendar, aggregation rules, date range and view rerun only this fragment
+@st.fragment
+def render_comparison(series):
+    col1, col2 = st.columns(2)
+    with col1:
+        aggregation = st.selectbox("Calendario común", list(alignment.CALENDARS.keys()), index=1)
+    with col2:
+        view = st.selectbox("Ver Tipo de Serie", ["Niveles", "Base 100", "Cambio Porcentual"])
+
+    # Per-indicator aggregation rule, defaulting to the one in the registry
+    with st.expander("Reglas de agregación"):
+        rules = {}
+        for label in series:
+            default = DATASETS[variable_dict[label]]["agg"]
+            rules[label] = st.selectbox(label, alignment.RULES, index=alignment.RULES.index(default), key=f"rule_{label}")
+
+    start = min(s.index.min() for s in series.values())
+    end = max(s.index.max() for s in series.values())
+    start_date, end_date = st.date_input("Seleccionar Rango de Fechas", [start, end])
+
+    with timed("transform", "comparar"):
+        wide = alignment.align(
+            series,
+            alignment.CALENDARS[aggregation],
+            rules,
+            start=pd.to_datetime(start_date),
+            end=pd.to_datetime(end_date),
+            freqs={label: DATASETS[variable_dict[label]]["freq"] for label in series},
+        )
+        if view == "Base 100":
+            wide = wide / wide.apply(lambda col: col.dropna().iloc[0] if col.notna().any() else float("nan")) * 100
+        elif view == "Cambio Porcentual":
+            wide = wide.pct_change(fill_method=None) * 100
+
+    # The encoded figure is cached under the first dataset, keyed by the
+    # versions of all the others and the view
+    with timed("figure", "comparar"):
+        keys = [variable_dict[label] for label in series]
+        versions = tuple(service.version(key) for key in keys[1:])
+        fig = charts.cached(
+            service, keys[0],
+            ("comparar", tuple(keys), versions, aggregation, view, tuple(rules.items()), start_date, end_date),
+            lambda: px.line(wide, x=wide.index, y=wide.columns, title=f"Comparación: {aggregation} ({view})"),
+        )
+    with timed("render", "comparar"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Correlation over the periods where every selected series has data
+    if len(series) > 1:
+        st.subheader("Correlación")
+        st.dataframe(wide.dropna().corr().round(2))
+
+    # Export Data: the file is only serialized when the user asks for it
+    col1, col2 = st.columns(2)
+    fmt = col1.selectbox("Formato", list(export.FORMATS))
+    if col2.button("Preparar descarga"):
+        with timed("export", "comparar"):
+            data = export.export_frame(wide, fmt)
+        st.download_button(f"Descargar {fmt}", data, export.file_name("comparacion", fmt), export.FORMATS[fmt][1])
+
+
+render_comparison(series)
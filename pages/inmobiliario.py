@@ -0,0 +1,145 @@
+import numpy as np
+import streamlit as st
+import plotly.express as px
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.ticker import FuncFormatter
+
+import charts
+from data_service import get_service, indicators
+from metrics import timed
+
+service = get_service()
+
+# USD formatter for y-axes
+usd_formatter = FuncFormatter(lambda x, _: f"${x:,.0f}")
+
+# Sidebar - Select type of property
+st.sidebar.title("Filtros")
+tipos_propiedad = indicators("inmobiliario")
+tipo_propiedad = st.sidebar.selectbox("Tipo de propiedad", list(tipos_propiedad.keys()))
+
+# Load corresponding file (Precio_m2 is computed by the loader)
+df = service.get(tipos_propiedad[tipo_propiedad])
+
+# Property type selector based on 'habitaciones'
+tipos_disponibles = df["habitaciones"].dropna().unique().tolist()
+tipo_seleccionado = st.sidebar.selectbox("Tipo específico", ["Todos"] + tipos_disponibles)
+
+# Filter if user selects a specific property subtype
+df_filtrado = df.copy()
+if tipo_seleccionado != "Todos":
+    df_filtrado = df_filtrado[df_filtrado["habitaciones"] == tipo_seleccionado]
+
+# Show stats tables
+st.subheader("Estadísticas descriptivas")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("**Precio en USD**")
+    st.dataframe(df_filtrado["Precio_USD"].describe().round(2))
+
+with col2:
+    st.markdown("**Superficie (m²)**")
+    st.dataframe(df_filtrado["Superficie_m2"].describe().round(2))
+
+with col3:
+    st.markdown("**Precio por m² (USD/m²)**")
+    st.dataframe(df_filtrado["Precio_m2"].describe().round(2))
+
+
+# Chart type and outlier removal rerun only this fragment
+@st.fragment
+def render_chart(dataset, tipo_seleccionado, df_filtrado):
+    # Selector de tipo de gráfico
+    tipo_visual = st.selectbox(
+        "¿Qué querés visualizar?",
+        ["Precios", "Superficie", "Precio por m²", "Precios y Superficie"]
+    )
+
+    # Plotting
+    st.subheader("Visualización")
+    plt.style.use('seaborn-v0_8')
+
+    if tipo_visual == "Precios":
+        fig, ax = plt.subplots()
+        sns.histplot(df_filtrado["Precio_USD"], bins=20, kde=True, ax=ax)
+        ax.set_title("Distribución de Precios (USD)")
+        ax.set_xlabel("Precio (USD)")
+        ax.set_ylabel("Frecuencia")
+        ax.xaxis.set_major_formatter(usd_formatter)
+        with timed("render", tipo_visual):
+            st.pyplot(fig)
+
+    elif tipo_visual == "Superficie":
+        fig, ax = plt.subplots()
+        sns.histplot(df_filtrado["Superficie_m2"], bins=20, kde=True, ax=ax, color='orange')
+        ax.set_title("Distribución de Superficies (m²)")
+        ax.set_xlabel("Superficie (m²)")
+        ax.set_ylabel("Frecuencia")
+        with timed("render", tipo_visual):
+            st.pyplot(fig)
+
+    elif tipo_visual == "Precio por m²":
+        fig, ax = plt.subplots()
+        sns.histplot(df_filtrado["Precio_m2"], bins=20, kde=True, ax=ax, color='green')
+        ax.set_title("Distribución de Precio por m²")
+        ax.set_xlabel("USD por m²")
+        ax.set_ylabel("Frecuencia")
+        ax.xaxis.set_major_formatter(usd_formatter)
+        with timed("render", tipo_visual):
+            st.pyplot(fig)
+
+    elif tipo_visual == "Precios y Superficie":
+        st.subheader("Precio vs. Superficie")
+
+        eliminar_outliers = st.checkbox("Eliminar outliers en superficie (m²)", value=True)
+
+        df_plot = df_filtrado.copy()
+
+        if eliminar_outliers:
+            with timed("transform", "outliers"):
+                Q1 = df_plot["Superficie_m2"].quantile(0.25)
+                Q3 = df_plot["Superficie_m2"].quantile(0.75)
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                df_plot = df_plot[
+                    (df_plot["Superficie_m2"] >= lower_bound) &
+                    (df_plot["Superficie_m2"] <= upper_bound)
+                ]
+
+        titulo = "Precio vs. Superficie" + (" (sin outliers)" if eliminar_outliers else "")
+
+        # Dense scatters go out as a WebGL plotly chart with binary-encoded
+        # points, cached per dataset version and filters, instead of a PNG
+        if len(df_plot) > charts.WEBGL_POINTS:
+            def build():
+                fig = px.scatter(df_plot, x="Superficie_m2", y="Precio_USD", title=titulo,
+                                 labels={"Superficie_m2": "Superficie (m²)", "Precio_USD": "Precio (USD)"})
+                datos = df_plot[["Superficie_m2", "Precio_USD"]].dropna()
+                pendiente, ordenada = np.polyfit(datos["Superficie_m2"], datos["Precio_USD"], 1)
+                x = np.array([datos["Superficie_m2"].min(), datos["Superficie_m2"].max()])
+                fig.add_scatter(x=x, y=ordenada + pendiente * x, mode="lines", line={"color": "red"}, name="Tendencia")
+                fig.update_yaxes(tickprefix="$", tickformat=",.0f")
+                return fig
+
+            with timed("figure", tipo_visual):
+                fig = charts.cached(service, dataset, ("scatter", tipo_seleccionado, eliminar_outliers), build)
+            with timed("render", tipo_visual):
+                st.plotly_chart(fig, use_container_width=True)
+            return
+
+        fig, ax = plt.subplots()
+        sns.scatterplot(data=df_plot, x="Superficie_m2", y="Precio_USD", ax=ax)
+        sns.regplot(data=df_plot, x="Superficie_m2", y="Precio_USD", scatter=False, ax=ax, color="red")
+        ax.set_title(titulo)
+        ax.set_xlabel("Superficie (m²)")
+        ax.set_ylabel("Precio (USD)")
+        ax.yaxis.set_major_formatter(usd_formatter)
+        with timed("render", tipo_visual):
+            st.pyplot(fig)
+
+
+render_chart(tipos_propiedad[tipo_propiedad], tipo_seleccionado, df_filtrado)
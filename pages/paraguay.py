@@ -0,0 +1,105 @@
+import streamlit as st
+import plotly.express as px
+
+from data_service import forecast_key, get_service, indicators
+import charts
+import forecasting
+from metrics import timed
+from seasonal import component
+
+service = get_service()
+
+# Streamlit UI
+st.title("📊 Visualización de Datos - Inflación & Actividad")
+
+# Dictionary mapping variable names to their dataset keys
+variable_dict = indicators("paraguay")
+
+# User selection
+selected_variable = st.selectbox("Seleccionar Indicador", list(variable_dict.keys()))
+
+# Define label for chart title
+label = "Inflación" if variable_dict[selected_variable] == "infla" else "IMAEP"
+
+# Fetch data based on user selection; only the indicator selector reruns this path
+df1 = service.get(variable_dict[selected_variable])
+
+# Seasonal components of every category, computed at refresh time
+components = service.get(indicators("desestacionalizado")[selected_variable])
+
+
+# Date range, category and chart type rerun only this fragment
+@st.fragment
+def render_chart(selected_variable, df1, components):
+    # Custom date selector
+    start_date, end_date = st.date_input(
+        "Seleccionar Rango de Fechas",
+        [df1.index.min(), df1.index.max()]
+    )
+
+    # Category selector
+    available_categories = df1.columns.tolist()
+    selected_category = st.selectbox("Seleccionar categoría", available_categories)
+
+    # Choose type of chart; every category can be seasonally adjusted
+    chart_type = st.radio("Tipo de visualización", ["Niveles", "Interanual", "Mensual"])
+    adjusted = st.checkbox("Desestacionalizar", value=chart_type == "Mensual")
+    show_forecast = chart_type == "Niveles" and not adjusted and st.checkbox("Mostrar pronóstico")
+
+    # Filter data by selected date range
+    df_filtered = df1.loc[start_date:end_date]
+    if adjusted:
+        series = component(components, "Desestacionalizada")[str(selected_category)].loc[start_date:end_date]
+        suffix = " (desestacionalizada)"
+    else:
+        series = df_filtered[selected_category]
+        suffix = ""
+
+    # Prepare data for plotting
+    with timed("transform", label):
+        if chart_type == "Niveles":
+            df_plot = series
+            chart_title = f"{selected_category} - Niveles{suffix}"
+        elif chart_type == "Interanual":
+            df_plot = series.pct_change(12) * 100
+            chart_title = f"{selected_category} - Variación Interanual{suffix}"
+        elif chart_type == "Mensual":
+            df_plot = series.pct_change(1) * 100
+            chart_title = f"{selected_category} - Variación Mensual{suffix}"
+
+        df_plot = df_plot.dropna()
+
+    # Plot; the encoded figure is cached per dataset version and view
+    def build():
+        if chart_type == "Niveles":
+            fig = px.line(
+                x=df_plot.index,
+                y=df_plot.values,
+                labels={"x": "Fecha", "y": "Nivel"},
+                title=chart_title
+            )
+            if adjusted:
+                trend = component(components, "Tendencia")[str(selected_category)].loc[start_date:end_date].dropna()
+                fig.add_scatter(x=trend.index, y=trend.values, mode="lines", name="Tendencia")
+            if show_forecast:
+                forecasting.overlay(fig, service.get(forecast_key(variable_dict[selected_variable])), selected_category)
+        else:
+            fig = px.bar(
+                x=df_plot.index,
+                y=df_plot.values,
+                labels={"x": "Fecha", "y": "Variación (%)"},
+                title=chart_title
+            )
+        return fig
+
+    # The forecast is re-derived on its own schedule, so its version is part of the view
+    with timed("figure", label):
+        forecast_version = service.version(forecast_key(variable_dict[selected_variable])) if show_forecast else None
+        view = ("chart", str(selected_category), chart_type, adjusted, forecast_version, start_date, end_date)
+        fig = charts.cached(service, variable_dict[selected_variable], view, build)
+
+    with timed("render", label):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+render_chart(selected_variable, df1, components)
@@ -0,0 +1,142 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+import datetime
+
+import cumulative
+import store
+from data_service import get_service
+from metrics import timed
+
+# Load data & model forecasts (fitted once per process by the data service)
+service = get_service()
+forecast_data = service.get("consumo")
+test_df = forecast_data["test_df"]
+
+# Prefix sums of actuals, predictions and errors, memory-mapped and shared by every
+# session; built once per dataset version, later runs only look them up
+prefixes = service.derived(
+    "consumo", "prefix", (),
+    lambda data: cumulative.prefix_sums(data["test_df"]['Global_active_power'].values, data["preds"]),
+)
+
+# App UI
+st.title("Pronóstico de Ventas Minoristas")
+
+
+# Model, forecast type and datetime window rerun only this fragment; the
+# predictions themselves are computed once per process by the data service
+@st.fragment
+def render_forecast(forecast_data, test_df, prefixes):
+    model_choice = st.selectbox("Elegir un Modelo", list(forecast_data["preds"].keys()))
+    forecast_type = st.radio("Forecast type", ["Pronóstico Puntual (por minute)", "Pronóstico Acumulado"])
+
+    st.subheader("Seleccionar fecha inicial y final (con hora y minutos)")
+
+    # Get min and max datetime from the dataset
+    min_dt = test_df['dt'].min()
+    max_dt = test_df['dt'].max()
+
+    # Select date
+    start_date = st.date_input("Fecha Inicial", value=min_dt.date(), min_value=min_dt.date(), max_value=max_dt.date())
+    start_time = st.time_input("Hora/Minuto", value=datetime.time(0, 0), key="start_time")
+
+    end_date = st.date_input("Fecha Final", value=min_dt.date(), min_value=min_dt.date(), max_value=max_dt.date())
+    end_time = st.time_input("Hora/Minuto", value=datetime.time(23, 59), key="end_time")
+
+    # Combine into full datetime
+    start_dt = datetime.datetime.combine(start_date, start_time)
+    end_dt = datetime.datetime.combine(end_date, end_time)
+
+    # Position indices of the window in the (sorted) test set
+    dts = test_df['dt'].values
+    start_pos = np.searchsorted(dts, np.datetime64(start_dt), side="left")
+    end_pos = np.searchsorted(dts, np.datetime64(end_dt), side="right")
+
+    # Prevent empty selections
+    if end_pos <= start_pos:
+        st.warning("No data available in the selected datetime range.")
+        return
+
+    with timed("transform", model_choice):
+        if forecast_type == "Pronóstico Acumulado":
+            # Cumulative series are differences of precomputed prefix sums
+            actual, preds, lower, upper = cumulative.cumulative_window(prefixes, model_choice, start_pos, end_pos)
+        else:
+            # Slice forecasts
+            preds = forecast_data["preds"][model_choice][start_pos:end_pos]
+
+            # Get actual values
+            actual = test_df['Global_active_power'].values[start_pos:end_pos]
+
+    with timed("figure", model_choice):
+        # Prepare chart dataframe
+        n = min(end_pos - start_pos, len(preds), len(actual))
+        chart_df = pd.DataFrame({
+            'Datetime': dts[start_pos:start_pos + n],
+            'Actual': actual[:n],
+            'Forecast': preds[:n]
+        })
+
+        # Altair line chart with y-axis label
+        chart = alt.Chart(chart_df).transform_fold(
+            ['Actual', 'Forecast'],
+            as_=['Series', 'Value']
+        ).mark_line().encode(
+            x='Datetime:T',
+            y=alt.Y('Value:Q', title='USD mn'),
+            color='Series:N'
+        ).properties(
+            width=800,
+            height=400
+        )
+
+        # Cumulative error band around the cumulative forecast
+        if forecast_type == "Pronóstico Acumulado":
+            chart_df['Lower'] = lower[:n]
+            chart_df['Upper'] = upper[:n]
+            band = alt.Chart(chart_df).mark_area(opacity=0.2).encode(
+                x='Datetime:T',
+                y='Lower:Q',
+                y2='Upper:Q'
+            )
+            chart = band + chart
+
+    with timed("render", model_choice):
+        st.altair_chart(chart, use_container_width=True)
+
+render_forecast(forecast_data, test_df, prefixes)
+
+
+# Accuracy from the walk-forward backtest (python backtest.py); only reads stored results
+@st.fragment
+def render_backtest():
+    st.subheader("Precisión de los modelos (backtest)")
+    if store.version("backtest_metricas") is None:
+        st.info("Todavía no hay resultados. Ejecutar `python backtest.py` para generarlos.")
+        return
+
+    by_horizon = service.get("backtest_metricas")
+    by_origin = service.get("backtest_origenes")
+    metric = st.radio("Métrica", ["MAE", "RMSE", "MAPE"], horizontal=True)
+
+    summary = by_horizon.groupby("modelo")[["MAE", "RMSE", "MAPE"]].mean()
+    st.dataframe(summary.round(4))
+
+    chart = alt.Chart(by_horizon).mark_line().encode(
+        x=alt.X('horizonte:Q', title='Horizonte (minutos)'),
+        y=alt.Y(f'{metric}:Q', title=metric),
+        color='modelo:N'
+    ).properties(title=f"{metric} por horizonte")
+    st.altair_chart(chart, use_container_width=True)
+
+    chart = alt.Chart(by_origin).mark_line().encode(
+        x=alt.X('origen:T', title='Origen'),
+        y=alt.Y(f'{metric}:Q', title=metric),
+        color='modelo:N'
+    ).properties(title=f"{metric} por origen")
+    st.altair_chart(chart, use_container_width=True)
+
+
+render_backtest()
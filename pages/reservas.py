@@ -0,0 +1,157 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from data_service import forecast_key, get_service, indicators
+import charts
+import export
+import forecasting
+import rolling
+import versioning
+from metrics import timed
+
+service = get_service()
+
+# Rolling views for daily series: option -> prefix of the rolling.analytics columns
+ROLLING_VIEWS = {
+    "Medias Móviles": "Media",
+    "Volatilidad": "Volatilidad",
+    "Drawdown": "Drawdown",
+}
+
+# Streamlit UI
+st.title("📊 Visualización de Datos - BCRA & INDEC")
+
+# Dictionary mapping variable names to their dataset keys
+variable_dict = indicators("bcra_indec")
+
+# The bulk export also carries the Paraguay indicators and every IPC opening
+BULK_KEYS = list(variable_dict.values()) + list(indicators("paraguay").values()) + list(indicators("indec").values())
+
+# User selection
+selected_variable = st.selectbox("Seleccionar Indicador", list(variable_dict.keys()))
+dataset = variable_dict[selected_variable]
+label = selected_variable
+
+# Fetch data based on user selection; only the indicator selector reruns this path
+df1 = service.get(dataset)
+
+
+# Date range, aggregation, transformation and export rerun only this fragment
+@st.fragment
+def render_chart(dataset, label, df1):
+    # Custom date selector
+    start_date, end_date = st.date_input(
+        "Seleccionar Rango de Fechas",
+        [df1.index.min(), df1.index.max()]
+    )
+
+    # Convert to datetime for proper slicing
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date)
+
+    df = df1.loc[start_date:end_date]
+
+    # If the user selects inflation or poverty, only show a bar chart
+    if dataset in ("inflacion", "pobreza"):
+        df_resampled = df
+        title = "Inflación Mensual (%)" if dataset == "inflacion" else "Pobreza Hogares (%)"
+        y_label = "Inflación (%)" if dataset == "inflacion" else "Pobreza (%)"
+        with timed("figure", dataset):
+            aux = df.index.strftime("%b %Y")  # Convert to "Mar 2025" format
+            fig = charts.cached(
+                service, dataset, ("bar", start_date, end_date),
+                lambda: px.bar(df.reset_index(), x=aux, y=df.columns[0], title=title, labels={"index": "Fecha", df.columns[0]: y_label}),
+            )
+    else:
+        # Rolling analytics are only offered for the daily BCRA series
+        transformations = ["Niveles", "Cambio Porcentual"]
+        if dataset != "bc":
+            transformations += list(ROLLING_VIEWS)
+
+        # Options for aggregation and transformation
+        aggregation = st.selectbox("Seleccionar Unidad de Tiempo", list(export.frequencies(dataset)))
+        transformation = st.selectbox("Ver Tipo de Serie", transformations)
+
+        # Batch forecasts are stored at the original frequency, in levels
+        show_forecast = (
+            transformation == "Niveles"
+            and export.frequencies(dataset)[aggregation] is None
+            and st.checkbox("Mostrar pronóstico")
+        )
+
+        with timed("transform", dataset):
+            # Rolling views slice columns precomputed over the full history
+            if transformation in ROLLING_VIEWS:
+                stats = rolling.analytics(service, dataset)
+                df = stats.loc[start_date:end_date, [c for c in stats.columns if c.startswith(ROLLING_VIEWS[transformation])]]
+                if transformation == "Medias Móviles":
+                    df = df1.loc[start_date:end_date].join(df)
+                df_resampled = export.resample(df, dataset, aggregation)
+            else:
+                # Resampling logic, over the full history and cached per dataset
+                # version; a new version only recomputes from its first changed row
+                df_resampled = service.derived(
+                    dataset, "resample", (aggregation,),
+                    lambda full: export.resample(full, dataset, aggregation),
+                    lambda prev, full, since: export.resample_since(prev, full, since, dataset, aggregation),
+                )
+
+                # Apply percentage change if selected
+                if transformation == "Cambio Porcentual":
+                    resampled = df_resampled
+                    df_resampled = service.derived(
+                        dataset, "pct_change", (aggregation,),
+                        lambda full: resampled.pct_change(fill_method=None) * 100,
+                        lambda prev, full, since: versioning.pct_change_incremental(prev, resampled, since),
+                    )
+
+                df_resampled = export.slice_resampled(df_resampled, dataset, aggregation, start_date, end_date)
+
+        # Plot the data; the encoded figure is cached per dataset version and view
+        def build():
+            fig = px.line(
+                df_resampled,
+                x=df_resampled.index,
+                y=df_resampled.columns,
+                title=f"{label}: {aggregation} ({transformation})"
+            )
+            if show_forecast:
+                forecasting.overlay(fig, service.get(forecast_key(dataset)), df1.columns[0])
+            return fig
+
+        # The forecast is re-derived on its own schedule, so its version is part of the view
+        with timed("figure", dataset):
+            forecast_version = service.version(forecast_key(dataset)) if show_forecast else None
+            view = ("line", start_date, end_date, aggregation, transformation, forecast_version)
+            fig = charts.cached(service, dataset, view, build)
+
+    with timed("render", dataset):
+        st.plotly_chart(fig)
+
+    if dataset in ("reservas", "base_monetaria"):
+        st.metric("Máxima caída en el período (%)", f"{rolling.max_drawdown(df1.loc[start_date:end_date].iloc[:, 0]):.1f}")
+
+    # Export Data: the file is only serialized when the user asks for it
+    col1, col2 = st.columns(2)
+    fmt = col1.selectbox("Formato", list(export.FORMATS))
+    if col2.button("Preparar descarga"):
+        with timed("export", dataset):
+            data = export.export_frame(df_resampled, fmt)
+        st.download_button(f"Descargar {fmt}", data, export.file_name("bcra_data", fmt), export.FORMATS[fmt][1])
+
+
+# Every indicator x frequency in one zip, built from the shared cache on request
+@st.fragment
+def render_bulk_export():
+    with st.expander("Exportar todas las series"):
+        fmt = st.selectbox("Formato", list(export.FORMATS), key="bulk_format")
+        if st.button("Preparar archivo"):
+            with timed("export", "bulk"):
+                path = export.bulk_archive(service, BULK_KEYS, fmt)
+            with open(path, "rb") as f:
+                st.download_button("Descargar ZIP", f, f"series_{export.FORMATS[fmt][0]}.zip", "application/zip")
+
+
+render_chart(dataset, label, df1)
+render_bulk_export()
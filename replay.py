@@ -0,0 +1,176 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Recorded upstream responses live in fixtures/<version>/<host>/<path>, with a
+# manifest.json per version describing every file
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MANIFEST = "manifest.json"
+
+
+def fixture_path(version_dir, host, path):
+    return os.path.join(version_dir, host, *path.strip("/").split("/"))
+
+
+# Capture every response fetched by the data service loaders into a new fixture version
+def record(version, keys=None):
+    import data_service
+
+    version_dir = os.path.join(FIXTURES_DIR, version)
+    files = {}
+    lock = threading.Lock()
+
+    def save(host, path, response):
+        target = fixture_path(version_dir, host, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(response.content)
+        with lock:
+            files[f"{host}{path}"] = {
+                "url": response.url,
+                "content_type": response.headers.get("Content-Type", "application/octet-stream"),
+                "bytes": len(response.content),
+                "sha256": hashlib.sha256(response.content).hexdigest(),
+            }
+
+    # Straight from upstream, bypassing the store; derived datasets fetch nothing
+    # of their own, so only their sources are recorded
+    data_service.set_recorder(save)
+    try:
+        for key in keys or data_service.DATASETS:
+            if data_service.DATASETS[key]["source"] is not None:
+                continue
+            try:
+                data_service.load_dataset(key)
+                print(f"recorded {key}")
+            except Exception as e:
+                print(f"skipped {key}: {e}")
+    finally:
+        data_service.set_recorder(None)
+
+    manifest = {
+        "version": version,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": files,
+    }
+    with open(os.path.join(version_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def latest_version():
+    versions = sorted(
+        name for name in os.listdir(FIXTURES_DIR)
+        if os.path.exists(os.path.join(FIXTURES_DIR, name, MANIFEST))
+    )
+    if not versions:
+        raise FileNotFoundError(f"No recorded fixtures in {FIXTURES_DIR}")
+    return versions[-1]
+
+
+# Replay settings shared by every request handler of one server
+class ReplayConfig:
+    def __init__(self, version_dir, latency=0.0, jitter=0.0, bandwidth=None, failure_rate=0.0, failure_status=503):
+        self.version_dir = version_dir
+        self.latency = latency  # seconds before the first byte
+        self.jitter = jitter  # uniform extra latency, seconds
+        self.bandwidth = bandwidth  # bytes per second, None for unlimited
+        self.failure_rate = failure_rate  # share of requests answered with failure_status
+        self.failure_status = failure_status
+        with open(os.path.join(version_dir, MANIFEST)) as f:
+            self.files = json.load(f)["files"]
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    config = None
+    chunk_size = 16 * 1024
+
+    def do_GET(self):
+        config = self.config
+        path = self.path.split("?", 1)[0]
+        host, _, rest = path.lstrip("/").partition("/")
+        entry = config.files.get(f"{host}/{rest}")
+
+        time.sleep(config.latency + random.uniform(0, config.jitter))
+        if entry is None:
+            self.send_error(404, "Not recorded")
+            return
+        if random.random() < config.failure_rate:
+            self.send_error(config.failure_status, "Injected failure")
+            return
+
+        with open(fixture_path(config.version_dir, host, "/" + rest), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", entry["content_type"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # Throttle to the configured bandwidth by pacing fixed-size chunks
+        for start in range(0, len(body), self.chunk_size):
+            chunk = body[start:start + self.chunk_size]
+            self.wfile.write(chunk)
+            if config.bandwidth:
+                time.sleep(len(chunk) / config.bandwidth)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Start a replay server in a daemon thread; point the loaders at it with
+# DASH_REPLAY_URL=http://<host>:<port>
+def serve(config, port=8765, host="127.0.0.1"):
+    handler = type("ReplayHandler", (_ReplayHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay the BCRA, INDEC, economia.gob.ar and GitHub sources")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="capture live responses into fixtures/<version>")
+    rec.add_argument("--version", default=datetime.now().strftime("%Y%m%d"))
+    rec.add_argument("--dataset", action="append", dest="keys", help="dataset key (repeatable, default: all)")
+
+    srv = sub.add_parser("serve", help="serve a recorded version locally")
+    srv.add_argument("--version", help="fixture version (default: latest)")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--latency", type=float, default=0.0, help="seconds")
+    srv.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    srv.add_argument("--bandwidth", type=float, help="bytes per second")
+    srv.add_argument("--failure-rate", type=float, default=0.0)
+    srv.add_argument("--failure-status", type=int, default=503)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        manifest = record(args.version, args.keys)
+        print(f"{len(manifest['files'])} files written to {os.path.join(FIXTURES_DIR, args.version)}")
+    else:
+        version = args.version or latest_version()
+        config = ReplayConfig(
+            os.path.join(FIXTURES_DIR, version),
+            latency=args.latency,
+            jitter=args.jitter,
+            bandwidth=args.bandwidth,
+            failure_rate=args.failure_rate,
+            failure_status=args.failure_status,
+        )
+        server = serve(config, args.port, args.host)
+        print(f"Replaying {version} on http://{args.host}:{args.port} (DASH_REPLAY_URL)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from metrics import instrumented
+
+# Calendar-day windows for the BCRA daily series
+WINDOWS = (30, 90, 365)
+# Business days per year, to annualize the volatility of daily returns
+TRADING_DAYS = 252
+
+_DAY = np.timedelta64(1, "D")
+
+
+# Running state of one time-based window: a FIFO of the points inside it,
+# running sums for the mean and return variance, and a monotonic deque for the peak
+class _Window:
+    def __init__(self, days):
+        self.span = days * _DAY
+        self.points = deque()  # (t, value, return)
+        self.peak = deque()  # (t, value), values strictly decreasing
+        self.total = 0.0
+        self.n_ret = 0
+        self.sum_ret = 0.0
+        self.sumsq_ret = 0.0
+
+    def push(self, t, value, ret):
+        self.points.append((t, value, ret))
+        self.total += value
+        if ret is not None:
+            self.n_ret += 1
+            self.sum_ret += ret
+            self.sumsq_ret += ret * ret
+        while self.peak and self.peak[-1][1] <= value:
+            self.peak.pop()
+        self.peak.append((t, value))
+
+        cutoff = t - self.span
+        while self.points[0][0] <= cutoff:
+            _, old_value, old_ret = self.points.popleft()
+            self.total -= old_value
+            if old_ret is not None:
+                self.n_ret -= 1
+                self.sum_ret -= old_ret
+                self.sumsq_ret -= old_ret * old_ret
+        while self.peak[0][0] <= cutoff:
+            self.peak.popleft()
+
+        mean = self.total / len(self.points)
+        if self.n_ret > 1:
+            var = (self.sumsq_ret - self.sum_ret * self.sum_ret / self.n_ret) / (self.n_ret - 1)
+            vol = math.sqrt(max(var, 0.0) * TRADING_DAYS) * 100
+        else:
+            vol = math.nan
+        drawdown = (value / self.peak[0][1] - 1) * 100
+        return mean, vol, drawdown
+
+
+def _arrays(series):
+    series = series.dropna().sort_index()
+    return pd.DatetimeIndex(series.index).as_unit("ns").to_numpy(), series.to_numpy(dtype=float)
+
+
+# Moving averages, annualized volatility and drawdowns for one daily series,
+# computed in a single O(n) pass. A new version of the series is handled by
+# rebuild(), which keeps the rows before its first change
+class RollingAnalytics:
+    def __init__(self, windows=WINDOWS):
+        self.days = windows
+        self.windows = [_Window(days) for days in windows]
+        self.columns = (
+            [f"Media {d}d" for d in windows]
+            + [f"Volatilidad {d}d (%)" for d in windows]
+            + [f"Drawdown {d}d (%)" for d in windows]
+            + ["Drawdown histórico (%)"]
+        )
+        self.times = []
+        self.values = []
+        self.rows = []
+        self.peak = -math.inf
+        self._frame = None
+
+    def _push(self, t, value):
+        ret = value / self.values[-1] - 1 if self.values and self.values[-1] != 0 else None
+        stats = [w.push(t, value, ret) for w in self.windows]
+        self.peak = max(self.peak, value)
+        self.times.append(t)
+        self.values.append(value)
+        self.rows.append(
+            [s[0] for s in stats] + [s[1] for s in stats] + [s[2] for s in stats]
+            + [(value / self.peak - 1) * 100]
+        )
+
+    @classmethod
+    @instrumented("transform", "rolling_build")
+    def build(cls, series, windows=WINDOWS):
+        state = cls(windows)
+        for t, v in zip(*_arrays(series)):
+            state._push(t, float(v))
+        return state
+
+    # New state for a revised series whose rows before `since` are unchanged:
+    # those rows are reused, the windows are refilled with the points that can
+    # still fall inside them, and only rows from `since` on are recomputed
+    @instrumented("transform", "rolling_rebuild")
+    def rebuild(self, series, since):
+        t, v = _arrays(series)
+        k = int(np.searchsorted(t, np.datetime64(pd.Timestamp(since).as_unit("ns"))))
+        if k == 0 or k > len(self.rows):
+            return self.build(series, self.days)
+
+        state = RollingAnalytics(self.days)
+        start = int(np.searchsorted(t, t[k] - max(self.days) * _DAY, side="right")) if k < len(t) else k
+        for i in range(start, k):
+            ret = v[i] / v[i - 1] - 1 if i > 0 and v[i - 1] != 0 else None
+            for w in state.windows:
+                w.push(t[i], float(v[i]), ret)
+        state.times = list(t[:k])
+        state.values = [float(x) for x in v[:k]]
+        state.rows = self.rows[:k]
+        state.peak = float(v[:k].max())
+        for ti, vi in zip(t[k:], v[k:]):
+            state._push(ti, float(vi))
+        return state
+
+    def frame(self):
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                np.array(self.rows, dtype=float).reshape(len(self.rows), len(self.columns)),
+                index=pd.DatetimeIndex(self.times, name="fecha"),
+                columns=self.columns,
+            )
+        return self._frame
+
+
+# Analytics of a dataset's first column, cached per dataset version by the data
+# service; a new version is patched from its first changed row
+def analytics(service, key):
+    state = service.derived(
+        key, "rolling", (),
+        lambda frame: RollingAnalytics.build(frame.iloc[:, 0]),
+        lambda prev, frame, since: prev.rebuild(frame.iloc[:, 0], since),
+    )
+    return state.frame()
+
+
+# Largest peak-to-trough fall (in %) inside an already sliced level series
+def max_drawdown(values):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return math.nan
+    return float(((values / np.maximum.accumulate(values)) - 1).min() * 100)
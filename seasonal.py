@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Classical (moving-average) seasonal decomposition of the monthly BCP tables.
+# Every column of a dataset is decomposed in one vectorized pass, so it runs at
+# refresh time and the pages only look the components up
+PERIOD = 12
+COMPONENTS = ["Original", "Tendencia", "Estacional", "Desestacionalizada"]
+
+
+# Centered 2x12 moving average along axis 0; the first and last PERIOD/2 rows are NaN
+def _trend(values, period=PERIOD):
+    if period % 2:
+        weights = np.full(period, 1.0 / period)
+    else:
+        weights = np.r_[0.5, np.ones(period - 1), 0.5] / period
+    n = len(values)
+    trend = np.full(values.shape, np.nan)
+    if n >= len(weights):
+        half = len(weights) // 2
+        trend[half:n - half] = sliding_window_view(values, len(weights), axis=0) @ weights
+    return trend
+
+
+# Decompose every column of a monthly frame. Strictly positive columns use the
+# multiplicative model (seasonal factors), the rest the additive one; the
+# seasonal component is a factor or an offset accordingly. Columns become
+# (Categoría, Componente)
+def decompose_frame(df, period=PERIOD):
+    values = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    multiplicative = np.all(values > 0, axis=0)
+    y = np.where(multiplicative, np.log(np.where(values > 0, values, 1.0)), values)
+
+    trend = _trend(y, period)
+    detrended = y - trend
+    season = df.index.month.to_numpy() - 1 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df)) % period
+    factors = np.zeros((period, y.shape[1]))
+    for m in range(period):
+        rows = detrended[season == m]
+        if np.isfinite(rows).any():
+            factors[m] = np.nanmean(rows, axis=0)
+    factors = np.nan_to_num(factors) - np.nanmean(np.nan_to_num(factors), axis=0)
+    seasonal = factors[season]
+    adjusted = y - seasonal
+
+    back = lambda a: np.where(multiplicative, np.exp(a), a)
+    parts = {
+        "Original": values,
+        "Tendencia": back(trend),
+        "Estacional": back(seasonal),
+        "Desestacionalizada": back(adjusted),
+    }
+    columns = pd.MultiIndex.from_product([[str(c) for c in df.columns], COMPONENTS], names=["Categoría", "Componente"])
+    data = np.stack([parts[c] for c in COMPONENTS], axis=2).reshape(len(df), -1)
+    return pd.DataFrame(data, index=df.index, columns=columns)
+
+
+# One component of every category, e.g. component(frame, "Desestacionalizada")
+def component(frame, name):
+    return frame.xs(name, axis=1, level="Componente")
@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime, timezone
+from io import BytesIO
+
+import pandas as pd
+
+# Snapshot bundles: one zip per version holding manifest.json and one
+# zstd-compressed Parquet file per dataset key
+SNAPSHOT_DIR = os.environ.get(
+    "DASH_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"),
+)
+BC_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bc.csv")
+FORMAT_VERSION = 1
+
+
+# Read-only view of one bundle; datasets are decoded lazily on first access
+class Bundle:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with zipfile.ZipFile(path) as zf:
+            self.manifest = json.loads(zf.read("manifest.json"))
+        self.version = self.manifest["version"]
+
+    def __contains__(self, key):
+        return key in self.manifest["datasets"]
+
+    def keys(self):
+        return list(self.manifest["datasets"])
+
+    def load(self, key):
+        entry = self.manifest["datasets"][key]
+        with self._lock, zipfile.ZipFile(self.path) as zf:
+            payload = zf.read(entry["file"])
+        return pd.read_parquet(BytesIO(payload))
+
+
+def bundle_path(version):
+    return os.path.join(SNAPSHOT_DIR, f"snapshot-{version}.zip")
+
+
+# Newest bundle in SNAPSHOT_DIR, or None when there is none yet
+def latest_bundle():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return None
+    names = sorted(n for n in os.listdir(SNAPSHOT_DIR) if n.startswith("snapshot-") and n.endswith(".zip"))
+    if not names:
+        return None
+    return Bundle(os.path.join(SNAPSHOT_DIR, names[-1]))
+
+
+# Write frames as a new bundle version; the zip is renamed into place only once complete
+def write_bundle(frames, version=None, origin="live"):
+    version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    target = bundle_path(version)
+    tmp = target + ".tmp"
+
+    datasets = {}
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for key, df in sorted(frames.items()):
+            df = df.infer_objects()
+            if not isinstance(df.columns, pd.MultiIndex):
+                df.columns = df.columns.map(str)
+            buffer = BytesIO()
+            df.to_parquet(buffer, compression="zstd")
+            payload = buffer.getvalue()
+            name = f"data/{key}.parquet"
+            zf.writestr(name, payload)
+            datasets[key] = {
+                "file": name,
+                "rows": len(df),
+                "columns": [str(c) for c in df.columns],
+                "bytes": len(payload),
+                "sha256": hashlib.sha256(payload).hexdigest(),
+            }
+        manifest = {
+            "format": FORMAT_VERSION,
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "origin": origin,
+            "datasets": datasets,
+        }
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+    os.replace(tmp, target)
+    return target
+
+
+# Parse the hand-exported bc.csv: monthly Balanza Comercial in the first column
+# pair and daily Reservas in the fourth, side by side with other frequencies
+def read_bc_csv(path=BC_CSV):
+    raw = pd.read_csv(path, header=None, skiprows=1)
+
+    def pair(date_col, value_col, column):
+        df = raw.iloc[:, [date_col, value_col]].dropna()
+        df.columns = ["fecha", column]
+        df["fecha"] = pd.to_datetime(df["fecha"], format="%m/%d/%Y")
+        return df.set_index("fecha").sort_index()
+
+    bc = pair(0, 1, "Balanza Comercial")
+    reservas = pair(6, 7, "valor")
+    return {"bc": bc, "reservas": reservas}
+
+
+# Fetch every DataFrame dataset (and/or seed from bc.csv) into a new bundle
+def build(keys=None, seed_csv=False, live=True):
+    import data_service
+
+    frames = {}
+    origin = []
+    if seed_csv:
+        frames.update(read_bc_csv())
+        origin.append("bc.csv")
+    # Straight from upstream, bypassing the store; derived datasets are computed
+    # from their source when it was loaded first
+    if live:
+        loaded = {}
+        for key in keys or data_service.DATASETS:
+            source = data_service.DATASETS[key]["source"]
+            try:
+                if source in loaded:
+                    frame = data_service.derive(key, loaded[source])
+                else:
+                    frame = data_service.load_dataset(key)
+                loaded[key] = frame
+            except Exception as e:
+                print(f"skipped {key}: {e}")
+                continue
+            if isinstance(frame, pd.DataFrame):
+                frames[key] = frame
+        origin.append("live")
+    return write_bundle(frames, origin="+".join(origin))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build offline snapshot bundles of every dataset")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="write a new bundle to the snapshot directory")
+    b.add_argument("--dataset", action="append", dest="keys", help="dataset key (repeatable, default: all)")
+    b.add_argument("--seed-csv", action="store_true", help="include Balanza Comercial and Reservas from bc.csv")
+    b.add_argument("--offline", action="store_true", help="do not fetch; only use --seed-csv")
+    sub.add_parser("show", help="print the manifest of the latest bundle")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(build(args.keys, seed_csv=args.seed_csv, live=not args.offline))
+    else:
+        bundle = latest_bundle()
+        print(json.dumps(bundle.manifest, indent=2) if bundle else "No snapshot bundles found")
+
+
+if __name__ == "__main__":
+    main()
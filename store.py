@@ -0,0 +1,70 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Local dataset store written by etl_worker.py and read by the dashboards:
+# one Parquet file per dataset key plus a small JSON sidecar with metadata
+STORE_DIR = os.environ.get(
+    "DASH_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "store"),
+)
+
+
+def _path(key, ext):
+    return os.path.join(STORE_DIR, f"{key}.{ext}")
+
+
+# Version token of a stored dataset (None if absent); changes on every write
+def version(key):
+    try:
+        return os.stat(_path(key, "parquet")).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def keys():
+    if not os.path.isdir(STORE_DIR):
+        return []
+    return sorted(n[:-len(".parquet")] for n in os.listdir(STORE_DIR) if n.endswith(".parquet"))
+
+
+# Write to a temp file and rename, so readers only ever see complete files
+def atomic_write(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# Parquet needs string column names; MultiIndex columns are kept as they are
+def to_parquet(df, path):
+    df = df.infer_objects()
+    if not isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.map(str)
+    df.to_parquet(path, compression="zstd")
+
+
+def write(key, df, **meta):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    meta = dict(meta, key=key, rows=len(df), written_at=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+
+    def write_meta(tmp):
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+
+    atomic_write(_path(key, "json"), write_meta)
+    atomic_write(_path(key, "parquet"), lambda tmp: to_parquet(df, tmp))
+
+
+def read(key):
+    return pd.read_parquet(_path(key, "parquet"))
+
+
+def metadata(key):
+    with open(_path(key, "json")) as f:
+        return json.load(f)
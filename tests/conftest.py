@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+
+# Revisions a dataset goes through between two versions. Each takes a series or
+# frame on a regular DatetimeIndex (with freq set) of at least 300 rows
+
+
+def _appended(data):
+    extra = pd.date_range(data.index[-1], periods=11, freq=data.index.freq, name=data.index.name)[1:]
+    tail = data.iloc[-10:] * 1.5
+    tail.index = extra
+    return pd.concat([data, tail])
+
+
+def _revised(data):
+    data = data.copy()
+    data.iloc[150] *= 2
+    return data
+
+
+def _removed(data):
+    return data.iloc[:-7]
+
+
+def _removed_middle(data):
+    return data.drop(data.index[200])
+
+
+CHANGES = {
+    "appended": _appended,
+    "revised": _revised,
+    "removed": _removed,
+    "removed_middle": _removed_middle,
+}
+
+
+@pytest.fixture(params=list(CHANGES))
+def change(request):
+    return CHANGES[request.param]
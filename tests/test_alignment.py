@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import alignment
+
+
+def _daily():
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2022-01-01", "2023-12-31", freq="D", name="fecha")
+    return pd.Series(rng.normal(2, 1, len(index)), index=index)
+
+
+def _compound(values):
+    return (np.prod(1 + values / 100) - 1) * 100
+
+
+RESAMPLED = {
+    "last": lambda r: r.last(),
+    "first": lambda r: r.first(),
+    "mean": lambda r: r.mean(),
+    "sum": lambda r: r.sum(min_count=1),
+    "compound": lambda r: r.apply(_compound),
+}
+
+
+@pytest.mark.parametrize("calendar", ["MS", "QS", "6MS", "YS"])
+@pytest.mark.parametrize("rule", alignment.RULES)
+def test_matches_resample(rule, calendar):
+    s = _daily()
+    wide = alignment.align({"s": s}, calendar, {"s": rule}, freqs={"s": "D"})
+    expected = RESAMPLED[rule](s.resample(calendar))
+    np.testing.assert_allclose(wide["s"].to_numpy(), expected.to_numpy())
+    assert (wide.index == expected.index).all()
+
+
+def test_unknown_rule():
+    with pytest.raises(ValueError):
+        alignment.align({"s": _daily()}, "MS", {"s": "median"})
+
+
+# A monthly rate holds through its last month on a daily calendar
+def test_last_holds_through_final_period():
+    index = pd.date_range("2023-01-01", "2023-06-01", freq="MS")
+    monthly = pd.Series(np.arange(6.0), index=index)
+    wide = alignment.align({"m": monthly}, "D", freqs={"m": "MS"}, end="2023-07-15")
+    assert (wide.loc["2023-06-01":"2023-06-30", "m"] == 5.0).all()
+    assert wide.loc["2023-07-01":, "m"].isna().all()
+
+
+# A longer series extends the calendar; the sparser one keeps its value for
+# the rest of its own period and no further
+def test_last_with_longer_series():
+    semi = pd.Series([30.0, 28.0], index=pd.DatetimeIndex(["2023-01-01", "2023-07-01"]))
+    monthly = pd.Series(1.0, index=pd.date_range("2023-01-01", "2024-06-01", freq="MS"))
+    wide = alignment.align({"semi": semi, "m": monthly}, "MS", freqs={"semi": "6MS", "m": "MS"})
+    assert (wide.loc["2023-07-01":"2023-12-01", "semi"] == 28.0).all()
+    assert wide.loc["2024-01-01":, "semi"].isna().all()
+    assert wide["m"].notna().all()
+
+
+def test_last_without_freq_stops_at_final_observation():
+    index = pd.date_range("2023-01-01", "2023-06-01", freq="MS")
+    monthly = pd.Series(np.arange(6.0), index=index)
+    wide = alignment.align({"m": monthly}, "D", end="2023-06-30")
+    assert wide.loc["2023-06-01", "m"] == 5.0
+    assert wide.loc["2023-06-02":, "m"].isna().all()
@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_service
+import versioning
+
+
+def _frame(offset):
+    index = pd.date_range("2024-01-01", periods=50, freq="D", name="fecha")
+    return pd.DataFrame({"valor": np.arange(50.0) + offset}, index=index)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setitem(data_service.DATASETS, "prueba", None)
+    data_service.register_dataset("prueba", lambda: _frame(0), "Prueba", "prueba")
+    return data_service.DataService(refresh=False)
+
+
+def test_version_matches_frame(service):
+    assert service.version("prueba") == versioning.content_hash(service.get("prueba"))
+    service._set("prueba", _frame(1))
+    assert service.version("prueba") == versioning.content_hash(_frame(1))
+
+
+# A value is never cached under a version other than the one of the frame it
+# was computed from, even when a refresh swaps the frame during the lookup
+def test_derived_during_swap(service, monkeypatch):
+    service.get("prueba")
+    swaps = [_frame(1)]
+
+    def record_cache(key, hit):
+        if swaps:
+            service._set(key, swaps.pop())
+
+    monkeypatch.setattr(data_service, "record_cache", record_cache)
+    service.derived("prueba", "hash", (), versioning.content_hash)
+    version, value = service._derived._entries[("prueba", "hash", ())]
+    assert value == version
+
+
+def test_derived_under_concurrent_swaps(service):
+    frames = [_frame(i) for i in range(4)]
+    stop = threading.Event()
+
+    def swap():
+        i = 0
+        while not stop.is_set():
+            service._set("prueba", frames[i % len(frames)])
+            i += 1
+
+    worker = threading.Thread(target=swap)
+    worker.start()
+    try:
+        for _ in range(2000):
+            service.derived("prueba", "hash", (), versioning.content_hash)
+            version, value = service._derived._entries[("prueba", "hash", ())]
+            assert value == version
+    finally:
+        stop.set()
+        worker.join()
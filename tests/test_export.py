@@ -0,0 +1,51 @@
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+import export
+import versioning
+
+
+# Stand-in for DataService: just frames and their content hashes
+class Frames:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get(self, key):
+        return self.frames[key]
+
+    def version(self, key):
+        return versioning.content_hash(self.frames[key])
+
+
+def _frames(offset=0.0):
+    daily = pd.date_range("2023-01-01", periods=100, freq="D", name="fecha")
+    monthly = pd.date_range("2020-01-01", periods=36, freq="MS", name="fecha")
+    return {
+        "reservas": pd.DataFrame({"valor": np.arange(100.0) + offset}, index=daily),
+        "actividad": pd.DataFrame({"IMAEP": np.arange(36.0)}, index=monthly),
+    }
+
+
+def test_bulk_archive_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_DIR", str(tmp_path))
+    path = export.bulk_archive(Frames(_frames()), ["reservas", "actividad"], "CSV")
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+    assert names == {f"reservas_{a.lower()}.csv" for a in export.DAILY_FREQUENCIES} | \
+        {f"actividad_{a.lower()}.csv" for a in export.MONTHLY_FREQUENCIES}
+
+
+# A new data version replaces the archive of the same format and leaves the others
+def test_bulk_archive_prunes_old_versions(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_DIR", str(tmp_path))
+    keys = ["reservas", "actividad"]
+    old_csv = export.bulk_archive(Frames(_frames()), keys, "CSV")
+    parquet = export.bulk_archive(Frames(_frames()), keys, "Parquet")
+    new_csv = export.bulk_archive(Frames(_frames(1.0)), keys, "CSV")
+    assert new_csv != old_csv
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [os.path.basename(new_csv), os.path.basename(parquet)])
+    assert export.bulk_archive(Frames(_frames(1.0)), keys, "CSV") == new_csv
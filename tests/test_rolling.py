@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+import rolling
+import versioning
+
+
+def _series(n=900):
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2021-01-01", periods=n, name="fecha")
+    return pd.Series(30000 + np.cumsum(rng.normal(0, 100, n)), index=index, name="valor")
+
+
+def test_rebuild_matches_full(change):
+    old = _series()
+    new = change(old)
+    since = versioning.first_change(versioning.diff(old.to_frame(), new.to_frame()))
+    patched = rolling.RollingAnalytics.build(old).rebuild(new, since).frame()
+    pd.testing.assert_frame_equal(patched, rolling.RollingAnalytics.build(new).frame())
+
+
+def test_rolling_mean_matches_pandas():
+    s = _series()
+    stats = rolling.RollingAnalytics.build(s).frame()
+    np.testing.assert_allclose(stats["Media 30d"], s.rolling("30D").mean())
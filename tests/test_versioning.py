@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+import versioning
+
+
+def _daily(n=400):
+    index = pd.date_range("2022-01-01", periods=n, freq="D", name="fecha")
+    return pd.DataFrame({"valor": np.linspace(100, 200, n) + np.sin(np.arange(n))}, index=index)
+
+
+def _since(old, new):
+    return versioning.first_change(versioning.diff(old, new))
+
+
+@pytest.mark.parametrize("aggregation", list(export.DAILY_FREQUENCIES))
+def test_resample_since_matches_full(change, aggregation):
+    old = _daily()
+    new = change(old)
+    prev = export.resample(old, "reservas", aggregation)
+    patched = export.resample_since(prev, new, _since(old, new), "reservas", aggregation)
+    pd.testing.assert_frame_equal(patched, export.resample(new, "reservas", aggregation), check_freq=False)
+
+
+def test_pct_change_incremental_matches_full(change):
+    old = _daily()
+    new = change(old)
+    prev = old.pct_change(fill_method=None) * 100
+    patched = versioning.pct_change_incremental(prev, new, _since(old, new))
+    pd.testing.assert_frame_equal(patched, new.pct_change(fill_method=None) * 100, check_freq=False)
+
+
+def test_pct_change_of_monthly_resample_matches_full(change):
+    old = _daily()
+    new = change(old)
+    since = _since(old, new)
+    resampled_old = export.resample(old, "reservas", "Mensual")
+    resampled_new = export.resample_since(resampled_old, new, since, "reservas", "Mensual")
+    prev = resampled_old.pct_change(fill_method=None) * 100
+    patched = versioning.pct_change_incremental(prev, resampled_new, since)
+    pd.testing.assert_frame_equal(patched, resampled_new.pct_change(fill_method=None) * 100, check_freq=False)
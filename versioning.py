@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import pandas as pd
+
+import store
+from metrics import instrumented
+
+# Immutable dataset versions, addressed by the hash of their content:
+# versions/<key>/<hash>.parquet plus versions/<key>/log.json with the lineage
+VERSIONS_DIR = os.path.join(store.STORE_DIR, "versions")
+
+
+@instrumented("version")
+def content_hash(df):
+    digest = hashlib.sha256()
+    digest.update(repr([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:20]
+
+
+# Row-level differences between two versions: one row per added, removed or
+# modified index label, with the kind of change in "cambio"
+@instrumented("version")
+def diff(old, new):
+    if not (old.index.is_unique and new.index.is_unique):
+        labels = old.index.union(new.index)
+        return pd.DataFrame({"cambio": "modificación"}, index=labels)
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = new.index.intersection(old.index)
+    if list(old.columns) != list(new.columns):
+        modified = common
+    else:
+        a = old.loc[common].to_numpy()
+        b = new.loc[common].to_numpy()
+        same = (a == b) | (pd.isna(a) & pd.isna(b))
+        modified = common[~same.all(axis=1)]
+    changes = pd.concat([
+        pd.Series("alta", index=added),
+        pd.Series("baja", index=removed),
+        pd.Series("modificación", index=modified),
+    ]).sort_index()
+    return changes.to_frame("cambio")
+
+
+# Earliest index label touched by a diff, or None when nothing changed
+def first_change(changes):
+    return changes.index.min() if len(changes) else None
+
+
+def _folder(key):
+    return os.path.join(VERSIONS_DIR, key)
+
+
+def history(key):
+    try:
+        with open(os.path.join(_folder(key), "log.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def load(key, version):
+    return pd.read_parquet(os.path.join(_folder(key), f"{version}.parquet"))
+
+
+# Store df as a new immutable version if its content is new. Returns
+# (version, changes); changes is None when df equals the latest version
+def commit(key, df):
+    version = content_hash(df)
+    entries = history(key)
+    if entries and entries[-1]["version"] == version:
+        return version, None
+
+    os.makedirs(_folder(key), exist_ok=True)
+    path = os.path.join(_folder(key), f"{version}.parquet")
+    if not os.path.exists(path):
+        store.atomic_write(path, lambda tmp: store.to_parquet(df, tmp))
+
+    changes = diff(load(key, entries[-1]["version"]), df) if entries else diff(df.iloc[:0], df)
+    since = first_change(changes)
+    entries.append({
+        "version": version,
+        "parent": entries[-1]["version"] if entries else None,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": len(df),
+        "added": int((changes["cambio"] == "alta").sum()),
+        "removed": int((changes["cambio"] == "baja").sum()),
+        "modified": int((changes["cambio"] == "modificación").sum()),
+        "since": str(since) if since is not None else None,
+    })
+
+    def write_log(tmp):
+        with open(tmp, "w") as f:
+            json.dump(entries, f, indent=2)
+
+    store.atomic_write(os.path.join(_folder(key), "log.json"), write_log)
+    return version, changes
+
+
+# Resample again only the bins from the one containing `since` onwards; bins
+# are right-labelled (W, ME, QE, YE), so earlier labels are untouched by the change
+def resample_incremental(prev, df, since, rule, how):
+    kept = prev[prev.index < since]
+    tail = df[df.index > kept.index[-1]] if len(kept) else df
+    return pd.concat([kept, getattr(tail.resample(rule), how)()])
+
+
+def pct_change_incremental(prev, df, since):
+    i = df.index.searchsorted(since)
+    if i == 0:
+        return df.pct_change(fill_method=None) * 100
+    # Only trailing rows were removed: the remaining changes are unchanged
+    if i >= len(df):
+        return prev[prev.index <= df.index[-1]]
+    tail = df.iloc[i - 1:].pct_change(fill_method=None).iloc[1:] * 100
+    return pd.concat([prev[prev.index < since], tail])
+
+
+# Memo of values derived from a dataset version (resamples, pct changes, figures).
+# When a dataset moves to a new version the entries are not dropped wholesale:
+# an entry with an `incremental` function is patched from the first changed row,
+# and only entries without one are recomputed
+class DerivedCache:
+    def __init__(self, max_entries=512):
+        self._entries = OrderedDict()  # (key, name, params) -> (version, value)
+        self._lineage = {}  # (key, version) -> (parent version, first changed label)
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def record_change(self, key, parent, version, since):
+        with self._lock:
+            self._lineage[(key, version)] = (parent, since)
+
+    # Earliest change between an ancestor version and the current one, if known
+    def _since(self, key, ancestor, version):
+        since = None
+        while version != ancestor:
+            link = self._lineage.get((key, version))
+            if link is None:
+                return None
+            version, step_since = link
+            if step_since is not None:
+                since = step_since if since is None else min(since, step_since)
+        return since
+
+    def get(self, key, version, name, params, compute, incremental=None):
+        entry_key = (key, name, params)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._entries.move_to_end(entry_key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = None
+        if entry is not None:
+            since = self._since(key, entry[0], version)
+            if since is not None and incremental is not None:
+                value = incremental(entry[1], since)
+        if value is None:
+            value = compute()
+
+        with self._lock:
+            self._entries[entry_key] = (version, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value